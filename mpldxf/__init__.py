@@ -26,7 +26,8 @@ IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
 CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
 from . import backend_dxf
-from .backend_dxf import FigureCanvasDXF
+from .backend_dxf import FigureCanvasDXF, save_figures
+from .font_index import rebuild_font_index
 
 __version__ = '0.1.0'
 
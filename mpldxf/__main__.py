@@ -0,0 +1,84 @@
+"""
+Export figures to DXF from the command line, see ``mpldxf.batch``:
+
+  python -m mpldxf -o out/ figures/*.pickle reports.plots:make_overview
+"""
+
+import argparse
+import importlib
+import os
+import sys
+import time
+
+from mpldxf.batch import export_figures
+
+# file extension of the output by compression
+EXTENSIONS = {None: '.dxf', 'gzip': '.dxfz', 'zip': '.zip'}
+
+
+def _resolve_source(spec):
+    """Return the figure source of a pickled figure file or a
+       ``module:function`` figure factory.
+    """
+    if os.path.exists(spec) or ':' not in spec:
+        return spec, os.path.splitext(os.path.basename(spec))[0]
+    module_name, _, qualname = spec.partition(':')
+    source = importlib.import_module(module_name)
+    for name in qualname.split('.'):
+        source = getattr(source, name)
+    return source, qualname
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m mpldxf',
+        description='Export pickled matplotlib figures or figure factories to DXF '
+                    'in parallel.')
+    parser.add_argument('sources', nargs='+', metavar='SOURCE',
+                        help='a pickled figure file or a module:function figure factory')
+    parser.add_argument('-o', '--output-dir', default='.',
+                        help='directory of the DXF files (default: current directory)')
+    parser.add_argument('-j', '--processes', type=int, default=None,
+                        help='number of worker processes (default: number of cores)')
+    parser.add_argument('--binary', action='store_true', help='write binary DXF')
+    parser.add_argument('--compression', choices=['gzip', 'zip'], default=None,
+                        help='compress the DXF files')
+    parser.add_argument('--streaming', action='store_true',
+                        help='stream entities to disk to limit memory use')
+    args = parser.parse_args(argv)
+
+    jobs = []
+    specs = {}
+    for spec in args.sources:
+        try:
+            source, name = _resolve_source(spec)
+        except (ImportError, AttributeError) as e:
+            parser.error('cannot load figure factory %s: %s' % (spec, e))
+        filename = os.path.join(args.output_dir, name + EXTENSIONS[args.compression])
+        # the exports would overwrite each other, in parallel even at once
+        if filename in specs:
+            parser.error('%s and %s are both exported to %s' % (specs[filename], spec, filename))
+        specs[filename] = spec
+        jobs.append((source, filename))
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    results = export_figures(jobs, processes=args.processes,
+                             fmt='bin' if args.binary else 'asc',
+                             compression=args.compression, streaming=args.streaming)
+    failed = 0
+    for result in results:
+        if result.error is None:
+            print('%-40s %8.2f s %9d entities  %s' % (
+                result.source, result.seconds, result.entities, result.filename))
+        else:
+            failed += 1
+            print('%-40s %8.2f s    FAILED  %s' % (
+                result.source, result.seconds, result.error.strip().splitlines()[-1]))
+    print('%d figures exported, %d failed in %.2f s' % (
+        len(results) - failed, failed, time.perf_counter() - start))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -11,6 +11,7 @@ Use as a matplotlib external backend:
 or register:
 
   matplotlib.backend_bases.register_backend('dxf', FigureCanvasDXF)
+  matplotlib.backend_bases.register_backend('dxfz', FigureCanvasDXF)
 
 Based on matplotlib.backends.backend_template.py.
 
@@ -37,41 +38,60 @@ CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
+import collections
+import contextlib
+import enum
+import functools
+import gzip
+import hashlib
+import io
 import logging
 import math
 import os
+import pickle
+import shutil
 import sys
+import tempfile
+import time
+import types
 import warnings
+import weakref
+import zipfile
+from datetime import datetime
 
 import ezdxf
 import ezdxf.math.clipping
 import numpy as np
 from ezdxf.enums import TextEntityAlignment
-from fontTools.ttLib import TTFont
-from matplotlib import font_manager
+from ezdxf.lldxf.const import BOUNDARY_PATH_DEFAULT, BOUNDARY_PATH_EXTERNAL
+from ezdxf.lldxf.tagwriter import BinaryTagWriter, TagWriter
+from ezdxf.tools.juliandate import juliandate
+from PIL import Image
+from matplotlib import cbook, font_manager
 from matplotlib.backend_bases import (RendererBase, FigureCanvasBase,
                                       GraphicsContextBase, FigureManagerBase)
 from matplotlib.backend_bases import _Backend
-from matplotlib.transforms import Affine2D
-from shapely.errors import GEOSException
-from shapely.geometry import box, LineString, Polygon
+from matplotlib.font_manager import FontProperties
+from matplotlib.path import Path
+from matplotlib.text import Text
+from matplotlib.transforms import (Affine2D, BboxBase, IdentityTransform, Transform,
+                                   TransformedPath)
 from shapely.ops import linemerge
-from mpldxf.functions import clip_geometry
+from mpldxf.font_index import get_ttf_files
+from mpldxf.functions import (LRUCache, chunk_polyline, clip_geometry, clip_polygons,
+                              decimate_minmax, even_odd_polygon, hatch_pattern_definition,
+                              nesting_depths, simplify_polyline, tile_hatch)
 
 _log = logging.getLogger(__name__)
 
-# fonts in site-packages\matplotlib\mpl-data\fonts\ttf should be installed on local
-# machine first for CAD software to recognize them
-TTF_FILES = {}
-for ttf_path in font_manager.findSystemFonts(fontpaths=None, fontext='ttf'):
-    ttf_file = os.path.basename(ttf_path)
-    if not ('.ttf' in ttf_file or '.TTF' in ttf_file):
-        continue
-    with TTFont(ttf_path) as ttfont:
-        names = ttfont['name'].names
-        family = str(names[1])
-        style = str(names[2])
-        TTF_FILES[ttf_file] = dict(family=family, bold='Bold' in style, italic='Italic' in style)
+
+def __getattr__(name):
+    # TTF_FILES used to be built at import time, it is now loaded lazily
+    # from the on-disk font index
+    if name == 'TTF_FILES':
+        return get_ttf_files()
+    raise AttributeError('module %r has no attribute %r' % (__name__, name))
+
 
 # TODO: Multiline text like in logplot not breaking lines correctly.:
 #       commenting points_to_pixels functions makes identical text wrapping but changes font position
@@ -96,23 +116,71 @@ def get_color_attribs(rgb_val):
     """Convert an RGB[A] colour to DXF colour index.
 
        ``rgb_val`` should be a tuple of values in range 0.0 - 1.0. Any
-       alpha value is ignored.
+       alpha value is ignored. The returned mapping is shared by all calls
+       with the same colour and cannot be modified.
     """
-    attribs = {}
     if rgb_val is None:
+        return _get_color_attribs(None)
+    return _get_color_attribs(tuple(float(v) for v in rgb_val[:3]))
+
+
+@functools.lru_cache(maxsize=4096)
+def _get_color_attribs(rgb):
+    attribs = {}
+    if rgb is None:
         attribs['color'] = 7
     # change black to white
-    elif np.allclose(np.array(rgb_val[:3]), np.zeros(3)):
+    elif all(abs(v) <= 1e-8 for v in rgb):
         attribs['color'] = 7
     else:
-        attribs['true_color'] = ezdxf.rgb2int(
-            255 * np.array(rgb_val[:3])
-        )
-    return attribs
+        attribs['true_color'] = ezdxf.rgb2int([255 * v for v in rgb])
+    return types.MappingProxyType(attribs)
+
+
+def get_true_colors(rgb_vals):
+    """Vectorized ``get_color_attribs`` for an (n, 3+) array of colours.
+
+       Returns an int array of DXF true colours, with -1 where the ACI
+       colour 7 has to be used instead.
+    """
+    rgb = np.asarray(rgb_vals, float)[:, :3]
+    true_colors = (255 * rgb).astype(int) & 0xFF
+    true_colors = (true_colors[:, 0] << 16) | (true_colors[:, 1] << 8) | true_colors[:, 2]
+    # change black to white
+    true_colors[np.isclose(rgb, 0, rtol=0).all(axis=1)] = -1
+    return true_colors
 
 
 HATCH_SCALE_FACTOR = 0.5  # * 0.5 to match pdf modified hatch density
+# draw matplotlib hatches as a single HATCH with a DXF pattern definition
+# instead of exploding them into many clipped LWPOLYLINE/HATCH entities
 HATCH_LINES_DRAW_AS_PAT = False
+# number of entities kept in memory in streaming mode before they are
+# written to the spool file, see RendererDXF.start_streaming
+STREAM_FLUSH_ENTITIES = 1000
+# simplify polylines after clipping so no vertex is removed that is further
+# than this from the simplified line, in drawing units (pixels at the figure
+# dpi). None keeps all vertices
+SIMPLIFY_TOLERANCE = None
+# large series: lines with monotonic x values (e.g. time series) of more than
+# DECIMATE_MIN_VERTICES vertices are reduced to the first, last, lowest and
+# highest vertex of every DECIMATE_BIN_WIDTH wide column (in drawing units,
+# i.e. pixels at the figure dpi), which keeps their envelope. None disables
+DECIMATE_MIN_VERTICES = None
+DECIMATE_BIN_WIDTH = 0.5
+# split open polylines into LWPOLYLINEs of at most this many vertices, very
+# long polylines are slow to open in CAD. None disables
+POLYLINE_MAX_VERTICES = None
+# space between the figures of a multi-figure drawing in inches, see
+# save_figures
+PAGE_SPACING = 1
+# resolution of raster images in dots per inch, None keeps the figure dpi.
+# Images are written as PNG files next to the DXF file, see draw_image
+IMAGE_DPI = None
+# number of text extents kept by get_text_width_height_descent
+TEXT_METRICS_CACHE_SIZE = 4096
+# number of parsed mathtext strings kept by draw_text
+MATHTEXT_CACHE_SIZE = 1024
 # https://stackoverflow.com/questions/47633546/relationship-between-dpi-and-figure-size
 # 1 / 72 to convert points to inches
 # 25.4 to convert inches to mm
@@ -155,6 +223,245 @@ LINEWIDTH_FACTOR = 25.4
 # print(args_PAT_format)
 
 
+# text extents by string, font, size and dpi shared by all renderers, see
+# RendererDXF.get_text_width_height_descent. text_metrics_cache.info() gives
+# the hit and miss statistics
+text_metrics_cache = LRUCache(TEXT_METRICS_CACHE_SIZE)
+# mathtext flattened to plain text by string and font, see
+# RendererDXF.draw_text
+mathtext_cache = LRUCache(MATHTEXT_CACHE_SIZE)
+
+
+def _font_key(prop):
+    """Return a hashable key of the font selected by the font properties
+       ``prop`` and its size, FontProperties are mutable.
+    """
+    return (tuple(prop.get_family()), prop.get_style(), prop.get_variant(),
+            prop.get_weight(), prop.get_stretch(), prop.get_file(),
+            prop.get_math_fontfamily(), prop.get_size_in_points())
+
+
+# pickled template drawings by DXF version, see new_drawing
+_DRAWING_TEMPLATES = {}
+
+
+def _create_template(dxfversion):
+    """Create the size independent part of a drawing."""
+    drawing = ezdxf.new(dxfversion=dxfversion, setup=True)
+    drawing.header["$LWDISPLAY"] = 1
+    drawing.header['$PSLTSCALE'] = 0
+    drawing.header['$PLINEGEN'] = 1
+    HIDDEN_LAYER = drawing.layers.add('HIDDEN')
+    HIDDEN_LAYER.off()
+    return drawing
+
+
+def new_drawing(dxfversion):
+    """Return a new drawing with the standard resources, header variables
+       and the HIDDEN layer already set up.
+
+       The drawing is cloned from a template that is built once per process
+       and DXF version, which is much cheaper than ``ezdxf.new(setup=True)``.
+    """
+    try:
+        template = _DRAWING_TEMPLATES[dxfversion]
+    except KeyError:
+        template = pickle.dumps(_create_template(dxfversion),
+                                protocol=pickle.HIGHEST_PROTOCOL)
+        _DRAWING_TEMPLATES[dxfversion] = template
+    drawing = pickle.loads(template)
+    # clones must not share the creation date and GUIDs of the template
+    drawing.header['$TDCREATE'] = juliandate(datetime.now())
+    drawing.reset_fingerprint_guid()
+    drawing.reset_version_guid()
+    return drawing
+
+
+def add_lwpolyline(layout, vertices, close=False, dxfattribs=None):
+    """Add an LWPOLYLINE with the (n, 2) array ``vertices`` to ``layout``.
+
+       The points of the polyline are set from the whole vertex array at
+       once, which is much faster than adding them one by one.
+    """
+    poly = layout.add_lwpolyline(points=(), close=close, dxfattribs=dxfattribs)
+    points = np.zeros((len(vertices), 5))
+    points[:, :2] = vertices
+    poly.lwpoints.set(points)
+    return poly
+
+
+@functools.lru_cache(maxsize=None)
+def get_hatch_pattern(hatch, size):
+    """Return the DXF pattern definition of the matplotlib ``hatch`` string
+       with a tile ``size`` in drawing units.
+    """
+    # copy the (cached) hatch path, simplification would collapse small
+    # shapes like stars to a few vertices
+    hpath = Path.hatch(hatch).copy()
+    hpath.should_simplify = False
+    polygons = hpath.to_polygons(closed_only=False)
+    return tuple(
+        [angle, (x * size, y * size), (dx * size, dy * size), [d * size for d in dashes]]
+        for angle, (x, y), (dx, dy), dashes in hatch_pattern_definition(polygons)
+    )
+
+
+# the entities a draw call of an incremental render added to the modelspace,
+# see RendererDXF.start_incremental
+_DrawRecord = collections.namedtuple('_DrawRecord', 'fingerprint entities groups')
+
+# attributes check_gc adds to a graphics context, they are derived from the
+# others
+_GC_DXF_ATTRS = frozenset(['_lineweight', '_hatch_lineweight', '_linetype', '_transparency',
+                           '_polyline_attribs'])
+
+
+class _NotCacheable(Exception):
+    """A draw call argument that cannot be fingerprinted."""
+
+
+def _update_fingerprint(h, obj):
+    """Feed the draw call argument ``obj`` to the hash ``h``."""
+    if obj is None or isinstance(obj, (str, bytes, bool, int, float, np.number, enum.Enum)):
+        h.update(repr(obj).encode())
+    elif isinstance(obj, np.ndarray):
+        if obj.dtype == object:
+            _update_fingerprint(h, obj.tolist())
+        else:
+            h.update(('%s%r' % (obj.dtype.str, obj.shape)).encode())
+            h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, (tuple, list)):
+        h.update(b'(%d' % len(obj))
+        for item in obj:
+            _update_fingerprint(h, item)
+    elif isinstance(obj, dict):
+        _update_fingerprint(h, sorted(obj.items()))
+    elif isinstance(obj, Path):
+        _update_fingerprint(h, (obj.vertices, obj.codes))
+    elif isinstance(obj, Transform):
+        if not obj.is_affine:
+            raise _NotCacheable(obj)
+        _update_fingerprint(h, obj.get_matrix())
+    elif isinstance(obj, BboxBase):
+        _update_fingerprint(h, obj.get_points())
+    elif isinstance(obj, TransformedPath):
+        _update_fingerprint(h, obj.get_fully_transformed_path())
+    elif isinstance(obj, GraphicsContextBase):
+        _update_fingerprint(h, [(k, v) for k, v in sorted(vars(obj).items())
+                                if k not in _GC_DXF_ATTRS])
+    elif isinstance(obj, FontProperties):
+        _update_fingerprint(h, hash(obj))
+    elif isinstance(obj, Text):
+        # the text properties draw_text uses
+        _update_fingerprint(h, (obj.get_ha(), obj.get_va(), obj.get_rotation_mode(),
+                                obj.get_transform().transform(obj.get_unitless_position())))
+    else:
+        raise _NotCacheable(obj)
+
+
+def _incremental(draw_method):
+    """Decorator for the draw methods of RendererDXF, in incremental mode the
+       entities of an identical call of the previous render are reused
+       instead of drawing them again, see ``RendererDXF.start_incremental``.
+    """
+    @functools.wraps(draw_method)
+    def wrapper(self, *args, **kwargs):
+        if self._draw_records is None or self._in_draw_call:
+            return draw_method(self, *args, **kwargs)
+        # calls are matched by their position in the tree of artist groups
+        counter = self._group_counters[-1]
+        key = self._group_keys[-1] + (counter[None],)
+        counter[None] += 1
+        try:
+            h = hashlib.sha1(draw_method.__name__.encode())
+            # module settings change the entities as well
+            _update_fingerprint(h, (HATCH_SCALE_FACTOR, HATCH_LINES_DRAW_AS_PAT,
+                                    IMAGE_DPI, LINEWIDTH_FACTOR, SIMPLIFY_TOLERANCE,
+                                    DECIMATE_MIN_VERTICES, DECIMATE_BIN_WIDTH,
+                                    POLYLINE_MAX_VERTICES, args, kwargs))
+            fingerprint = h.digest()
+        except _NotCacheable:
+            fingerprint = None
+        previous = self._previous_records.pop(key, None)
+        if previous is not None:
+            if fingerprint is not None and previous.fingerprint == fingerprint:
+                self._draw_records[key] = previous
+                self.incremental_stats['reused'] += 1
+                return
+            self._delete_record(previous)
+        space = self.modelspace.entity_space
+        start = len(space)
+        self._record_groups = []
+        self._in_draw_call = True
+        try:
+            draw_method(self, *args, **kwargs)
+        finally:
+            self._in_draw_call = False
+        self._draw_records[key] = _DrawRecord(
+            fingerprint, [space[i] for i in range(start, len(space))], self._record_groups)
+        self._record_groups = None
+        self.incremental_stats['drawn'] += 1
+    return wrapper
+
+
+class RenderStats:
+    """Timings and counters of a DXF export, pass one to ``print_dxf`` (or
+       ``savefig``) to fill it.
+
+       ``timings`` maps the names of the renderer methods to their number
+       of calls and cumulative seconds, which include the methods they call.
+       ``entities`` counts the entities by type, ``counts`` the groups,
+       linetypes, text styles and blocks created.
+    """
+
+    def __init__(self):
+        self.timings = {}
+        self.entities = collections.Counter()
+        self.counts = collections.Counter()
+
+    def add_time(self, name, seconds):
+        timing = self.timings.setdefault(name, [0, 0.0])
+        timing[0] += 1
+        timing[1] += seconds
+
+    def as_dict(self):
+        """Return the statistics as a dict of plain types, e.g. for JSON."""
+        return dict(
+            timings={name: dict(calls=calls, seconds=seconds)
+                     for name, (calls, seconds) in self.timings.items()},
+            entities=dict(self.entities),
+            counts=dict(self.counts),
+        )
+
+    def __str__(self):
+        lines = ['%-24s %8d calls %10.4f s' % (name, calls, seconds)
+                 for name, (calls, seconds) in sorted(self.timings.items(),
+                                                      key=lambda item: -item[1][1])]
+        lines.append('entities: %s' % ', '.join(
+            '%s %d' % item for item in sorted(self.entities.items())))
+        lines.append('created: %s' % ', '.join(
+            '%s %d' % item for item in sorted(self.counts.items())))
+        return '\n'.join(lines)
+
+
+def _timed(name):
+    """Decorator adding the time of a RendererDXF method to the render
+       stats as ``name`` when they are collected.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.stats is None:
+                return method(self, *args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                self.stats.add_time(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
 class RendererDXF(RendererBase):
     """
     The renderer handles drawing/rendering operations.
@@ -168,6 +475,9 @@ class RendererDXF(RendererBase):
         self.width = width
         self.dpi = dpi
         self.dxfversion = dxfversion
+        self._spool = None
+        # RenderStats filled while drawing, see print_dxf
+        self.stats = None
         self._init_drawing()
         self._groupd = []
 
@@ -175,20 +485,49 @@ class RendererDXF(RendererBase):
         """Create a drawing, set some global information and add
            the layers we need.
         """
-        drawing = ezdxf.new(dxfversion=self.dxfversion, setup=True)
-        for ttf_file, extended_data in TTF_FILES.items():
-            text_style = drawing.styles.add(ttf_file, font=ttf_file)
-            text_style.set_extended_font_data(**extended_data)
+        drawing = new_drawing(self.dxfversion)
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
+        # text styles are added on first use by _get_text_style
+        self._text_styles = {}
+        # DXF attributes by graphics context state, see check_gc
+        self._gc_attribs = {}
+        # how often _draw_mpl_patch found paths 'unclipped', fully 'inside',
+        # fully 'outside' or crossing the clip box ('clipped')
+        self.clip_stats = collections.Counter()
+        # marker block names by marker style, see _get_marker_block
+        self._marker_blocks = {}
+        # PNG data of the raster images by file name and their IMAGEDEFs by
+        # content hash, see draw_image
+        self.images = {}
+        self._image_defs = {}
+        # number of entities written to the spool file, see start_streaming
+        self.streamed_entities = 0
+        # incremental mode state, see start_incremental
+        self._draw_records = None
+        self._previous_records = {}
+        self._record_groups = None
+        self._in_draw_call = False
+        self._group_keys = [()]
+        self._group_counters = [collections.Counter()]
+        self.incremental_stats = collections.Counter()
 
-        modelspace = drawing.modelspace()
+        self.drawing = drawing
+        self.modelspace = drawing.modelspace()
+        # modelspace origin of the figure and index of its first entity, see
+        # start_page
+        self._page_origin = (0, 0)
+        self._page_start = 0
         drawing.header['$EXTMIN'] = (0, 0, 0)
         drawing.header['$EXTMAX'] = (self.width, self.height, 0)
-        drawing.header["$LWDISPLAY"] = 1
-        drawing.header['$PSLTSCALE'] = 0
-        drawing.header['$PLINEGEN'] = 1
-        HIDDEN_LAYER = drawing.layers.add('HIDDEN')
-        HIDDEN_LAYER.off()
-        layout = drawing.layout('Layout1')
+        self._setup_page(drawing.layout('Layout1'))
+
+    def _setup_page(self, layout):
+        """Set up the paperspace ``layout`` with a viewport showing the
+           figure at the current page origin of the modelspace.
+        """
+        x0, y0 = self._page_origin
         paper_size_mm = (self.width / 100 * 25.4, self.height / 100 * 25.4)
         layout.page_setup(
             size=paper_size_mm,
@@ -197,23 +536,217 @@ class RendererDXF(RendererBase):
         layout.add_viewport(
             center=(paper_size_mm[0] * 0.5, paper_size_mm[1] * 0.5),
             size=paper_size_mm,
-            view_center_point=(self.width * 0.5, self.height * 0.5),
+            view_center_point=(x0 + self.width * 0.5, y0 + self.height * 0.5),
             view_height=self.height,
             dxfattribs=dict(status=-1),  # set to not active
         )
-        self.drawing = drawing
-        self.modelspace = modelspace
+
+    def start_page(self, width, height, dpi, name):
+        """Start drawing another figure of ``width`` x ``height`` pixels at
+           ``dpi`` into the same drawing, call ``finish_page`` once it is
+           drawn.
+
+           The figure is placed to the right of the previous ones in the
+           modelspace and gets its own paperspace layout ``name``. Text
+           styles, linetypes, marker blocks and images are shared by all
+           figures of the drawing.
+        """
+        x0 = self.drawing.header['$EXTMAX'][0] + PAGE_SPACING * self.dpi
+        self.width = width
+        self.height = height
+        self.dpi = dpi
+        self._page_origin = (x0, 0)
+        self._page_start = len(self.modelspace.entity_space)
+        # lineweights and linetypes depend on the dpi
+        self._gc_attribs = {}
+        extmax = self.drawing.header['$EXTMAX']
+        self.drawing.header['$EXTMAX'] = (x0 + width, max(extmax[1], height), 0)
+        self._setup_page(self.drawing.layouts.new(name))
+
+    def finish_page(self):
+        """Move the entities of the figure drawn since ``start_page`` to its
+           place in the modelspace.
+        """
+        x0, y0 = self._page_origin
+        if x0 == 0 and y0 == 0:
+            return
+        space = self.modelspace.entity_space
+        for i in range(self._page_start, len(space)):
+            space[i].translate(x0, y0, 0)
+
+    def _count(self, name):
+        # count created DXF resources if stats are collected
+        if self.stats is not None:
+            self.stats.counts[name] += 1
+
+    def _get_text_style(self, prop):
+        """Return the name of the text style to use for the font properties
+           ``prop``, adding it to the drawing the first time it is needed.
+        """
+        key = hash(prop)
+        try:
+            return self._text_styles[key]
+        except KeyError:
+            pass
+        fontname = os.path.basename(font_manager.findfont(prop))
+        if fontname not in self.drawing.styles:
+            # fonts in site-packages\matplotlib\mpl-data\fonts\ttf should be installed on local
+            # machine first for CAD software to recognize them
+            text_style = self.drawing.styles.add(fontname, font=fontname)
+            self._count('styles')
+            extended_data = get_ttf_files().get(fontname)
+            if extended_data is not None:
+                text_style.set_extended_font_data(**extended_data)
+        self._text_styles[key] = fontname
+        return fontname
+
+    def _new_tagwriter(self, stream, fmt):
+        """Return a tag writer for ASCII (``fmt='asc'``) or binary (``'bin'``)
+           DXF like ``ezdxf.document.Drawing.write`` does.
+        """
+        if fmt == 'asc':
+            return TagWriter(stream, dxfversion=self.drawing.dxfversion)
+        elif fmt == 'bin':
+            return BinaryTagWriter(stream, dxfversion=self.drawing.dxfversion,
+                                   encoding=self.drawing.output_encoding)
+        raise ValueError("Unknown output format: '%s'" % fmt)
+
+    def start_streaming(self, fmt='asc'):
+        """Write the modelspace entities to a temporary spool file as they
+           are drawn instead of keeping them all in memory, the drawing is
+           then written with ``write_streamed`` in the format ``fmt``.
+
+           The header and tables are only complete once the figure is drawn
+           (e.g. text styles and linetypes are added on first use), so they
+           are written at the end and the spooled entities are copied into
+           the ENTITIES section. Entities are not grouped in this mode.
+        """
+        if fmt == 'bin':
+            self._spool = tempfile.TemporaryFile(mode='w+b')
+        else:
+            self._spool = tempfile.TemporaryFile(
+                mode='w+t', encoding=self.drawing.output_encoding, errors='dxfreplace')
+        self._spool_writer = self._new_tagwriter(self._spool, fmt)
+        self._spool_fmt = fmt
+
+    def _flush_entities(self):
+        """Write the modelspace entities to the spool file and delete them."""
+        entity_space = self.modelspace.entity_space
+        entity_space.export_dxf(self._spool_writer)
+        entities = list(entity_space)
+        entity_space.clear()
+        self.streamed_entities += len(entities)
+        if self.stats is not None:
+            self.stats.entities.update(e.dxftype() for e in entities)
+        entitydb = self.drawing.entitydb
+        for entity in entities:
+            entitydb.delete_entity(entity)
+
+    def _check_spool(self):
+        # in streaming mode, write the entities out once enough piled up
+        if self._spool is not None and len(self.modelspace.entity_space) >= STREAM_FLUSH_ENTITIES:
+            self._flush_entities()
+
+    def write_streamed(self, stream):
+        """Write the drawing with the spooled entities to ``stream``, a text
+           stream for ASCII or a binary stream for binary DXF, and close the
+           spool file. This follows ``ezdxf.document.Drawing.write``.
+        """
+        self._flush_entities()
+        drawing = self.drawing
+        drawing.commit_pending_changes()
+        drawing.classes.add_required_classes(drawing.dxfversion)
+        drawing.update_all()
+        tagwriter = self._new_tagwriter(stream, self._spool_fmt)
+        if self._spool_fmt == 'bin':
+            tagwriter.write_signature()
+        drawing.header.export_dxf(tagwriter)
+        drawing.classes.export_dxf(tagwriter)
+        drawing.tables.export_dxf(tagwriter)
+        drawing.blocks.export_dxf(tagwriter)
+        tagwriter.write_str('  0\nSECTION\n  2\nENTITIES\n')
+        self._spool.seek(0)
+        shutil.copyfileobj(self._spool, stream)
+        drawing.layouts.active_layout().entity_space.export_dxf(tagwriter)
+        tagwriter.write_tag2(0, 'ENDSEC')
+        drawing.objects.export_dxf(tagwriter)
+        tagwriter.write_tag2(0, 'EOF')
+        self._spool.close()
+        self._spool = None
+
+    def start_incremental(self):
+        """Start an incremental render of the figure.
+
+           The entities added by every draw call are kept together with a
+           fingerprint of the call arguments. The next incremental render
+           reuses the entities of calls that are identical to the previous
+           render instead of drawing them again, and replaces the entities of
+           changed calls in place. Call ``finish_incremental`` once the
+           figure is drawn.
+        """
+        if self._draw_records is None:
+            # entities of a full render do not belong to any draw call
+            if len(self.modelspace):
+                self.clear()
+            self._draw_records = {}
+        self._previous_records = self._draw_records
+        self._draw_records = {}
+        self._group_keys = [()]
+        self._group_counters = [collections.Counter()]
+        self.incremental_stats = collections.Counter()
+
+    def finish_incremental(self):
+        """Delete the entities of calls the render did not repeat (e.g. of
+           removed artists) and put the entities back in drawing order.
+        """
+        for record in self._previous_records.values():
+            self._delete_record(record)
+        self._previous_records = {}
+        space = self.modelspace.entity_space
+        space.clear()
+        for record in self._draw_records.values():
+            space.extend(record.entities)
+        _log.debug('Incremental render: %d draw calls reused, %d drawn',
+                   self.incremental_stats['reused'], self.incremental_stats['drawn'])
+
+    def _delete_record(self, record):
+        """Delete the entities and groups of a draw call."""
+        for group in record.groups:
+            self.drawing.groups.delete(group)
+        entitydb = self.drawing.entitydb
+        for entity in record.entities:
+            if entity.is_alive:
+                entitydb.delete_entity(entity)
 
     def clear(self):
         """Reset the renderer."""
-        super(RendererDXF, self).clear()
         self._init_drawing()
 
     def check_gc(self, gc):
-        gc._lineweight = self.points_to_pixels(gc.get_linewidth()) * LINEWIDTH_FACTOR
-        gc._hatch_lineweight = self.points_to_pixels(gc.get_hatch_linewidth()) * LINEWIDTH_FACTOR
+        """Set the DXF attributes of ``gc``, they are resolved once per
+           graphics context state and shared by all entities with that state.
+        """
+        rgb = gc.get_rgb()
+        offset, seq = gc.get_dashes()  # offset not considered
+        key = (gc.get_linewidth(), gc.get_hatch_linewidth(),
+               None if seq is None else tuple(map(float, seq)),
+               gc.get_forced_alpha(), gc.get_alpha(),
+               None if rgb is None else tuple(map(float, rgb)))
+        try:
+            attribs = self._gc_attribs[key]
+        except KeyError:
+            attribs = self._gc_attribs[key] = self._resolve_gc(gc)
+        (gc._lineweight, gc._hatch_lineweight, gc._linetype, gc._transparency,
+         gc._polyline_attribs) = attribs
+
+    def _resolve_gc(self, gc):
+        """Return the DXF attributes of ``gc`` for ``check_gc``, adding its
+           linetype to the drawing if needed.
+        """
+        lineweight = self.points_to_pixels(gc.get_linewidth()) * LINEWIDTH_FACTOR
+        hatch_lineweight = self.points_to_pixels(gc.get_hatch_linewidth()) * LINEWIDTH_FACTOR
 
-        gc._linetype = None
+        linetype = None
         offset, seq = gc.get_dashes()  # offset not considered
         if seq is not None:
             FACTOR = self.points_to_pixels(1)
@@ -226,37 +759,51 @@ class RendererDXF(RendererBase):
                     pattern=pattern,
                     description=name,
                 )
-            gc._linetype = name
+                self._count('linetypes')
+            linetype = name
 
-        gc._transparency = None
+        transparency = None
         if gc.get_forced_alpha():
             alpha = gc.get_alpha()
             if alpha != 1:
-                gc._transparency = 1 - alpha
+                transparency = 1 - alpha
         else:
             alpha = gc.get_rgb()[3]
             if alpha != 0 and alpha != 1:
-                gc._transparency = 1 - alpha
+                transparency = 1 - alpha
+
+        polyline_attribs = {**get_color_attribs(gc.get_rgb())}
+        if linetype is not None:
+            polyline_attribs['linetype'] = linetype
+        polyline_attribs['lineweight'] = lineweight
+        if lineweight == 0 or gc.get_rgb() is None:
+            polyline_attribs['layer'] = 'HIDDEN'
+        return (lineweight, hatch_lineweight, linetype, transparency,
+                types.MappingProxyType(polyline_attribs))
 
     def _get_polyline_attribs(self, gc):
-        attribs = {**get_color_attribs(gc.get_rgb())}
-        if gc._linetype is not None:
-            attribs['linetype'] = gc._linetype
-        attribs['lineweight'] = gc._lineweight
-        if attribs['lineweight'] == 0 or gc.get_rgb() is None:
-            attribs['layer'] = 'HIDDEN'
-        return attribs
+        # resolved by check_gc, the mapping is shared and read-only
+        return gc._polyline_attribs
 
     def set_entity_attribs(self, gc, entity):
         if gc._transparency is not None:
             entity.transparency = gc._transparency
 
-    def _clip_mpl(self, vertices, clippoly):
-        return clip_geometry(vertices, clippoly)
-
-    def _draw_mpl_patch(self, gc, path, transform, rgbFace=None, obj=None):
-        '''Draw a matplotlib patch object
+    @_timed('clip_geometry')
+    def _clip_mpl(self, vertices, clippoly, join=True):
+        """Clip ``vertices`` and return the list of polylines to draw."""
+        if join:
+            vertices = clip_geometry(vertices, clippoly)
+            return [] if vertices is None else [vertices]
+        return clip_geometry(vertices, clippoly, join=False)
+
+    @_timed('_draw_mpl_patch')
+    def _draw_mpl_patch(self, gc, path, transform, rgbFace=None, obj=None, layout=None):
+        '''Draw a matplotlib patch object into ``layout`` (the modelspace by
+           default)
         '''
+        if layout is None:
+            layout = self.modelspace
         # Using clip = bbox in path.cleaned and width / height attributes in path.to_polygons
         # would be great, but it does not work correctly for some cases (e.g. it splits polygons
         # when they are clipped) so hatching, that depends on closed continuous polygons is not
@@ -264,16 +811,34 @@ class RendererDXF(RendererBase):
         # Do NOT use simplify on path.cleaned, it produces strange vertices at 0, 0
         bbox = gc.get_clip_rectangle()
         path = path.cleaned(transform=transform, remove_nans=True, simplify=False)
-        if bbox is not None:
-            clippoly = box(bbox.x0, bbox.y0, bbox.x1, bbox.y1)
+        clippoly = None
+        if bbox is None:
+            self.clip_stats['unclipped'] += 1
         else:
-            clippoly = None
+            # compare extents first, clipping is only needed for paths that
+            # cross the clip box. The extents of the control points are good
+            # enough here and much cheaper than path.get_extents. Cleaning
+            # gives STOP and CLOSEPOLY codes a (0, 0) vertex, those are left out
+            points = path.vertices[~np.isin(path.codes, (Path.STOP, Path.CLOSEPOLY))]
+            if not len(points):
+                return
+            (ex0, ey0), (ex1, ey1) = points.min(axis=0), points.max(axis=0)
+            x0, y0, x1, y1 = min(bbox.x0, bbox.x1), min(bbox.y0, bbox.y1), \
+                max(bbox.x0, bbox.x1), max(bbox.y0, bbox.y1)
+            if ex0 >= x0 and ex1 <= x1 and ey0 >= y0 and ey1 <= y1:
+                self.clip_stats['inside'] += 1
+            elif ex0 > x1 or ex1 < x0 or ey0 > y1 or ey1 < y0:
+                self.clip_stats['outside'] += 1
+                return
+            else:
+                self.clip_stats['clipped'] += 1
+                clippoly = (x0, y0, x1, y1)
 
         dxfattribs = self._get_polyline_attribs(gc)
 
         group_data = []
         if rgbFace is not None:
-            hatch = self.modelspace.add_hatch(
+            hatch = layout.add_hatch(
                 dxfattribs=get_color_attribs(rgbFace)
             )
             self.set_entity_attribs(gc, hatch)
@@ -281,100 +846,122 @@ class RendererDXF(RendererBase):
         else:
             hatch = None
 
+        if HATCH_LINES_DRAW_AS_PAT and gc.get_hatch() is not None:
+            pattern_hatch = self._add_pattern_hatch(gc, layout)
+            if pattern_hatch is not None:
+                group_data.append(pattern_hatch)
+        else:
+            pattern_hatch = None
+
+        # outlines of filled or hatched areas are clipped to one closed
+        # polyline, plain lines are split where they leave the clip box
+        join = rgbFace is not None or gc.get_hatch() is not None
+        boundaries = []
         for vertices in path.to_polygons(closed_only=False):
             if clippoly is not None:
-                vertices = self._clip_mpl(vertices, clippoly)
-                if vertices is None:
-                    continue
-            close = (rgbFace is not None) or (len(vertices) > 1 and np.array_equal(vertices[0], vertices[-1]))
-            poly = self.modelspace.add_lwpolyline(points=vertices,
-                                                  close=close,
-                                                  dxfattribs=dxfattribs)
-            poly.set_flag_state(128, True)
-            self.set_entity_attribs(gc, poly)
-
-            if rgbFace is not None:
-                hpath = hatch.paths.add_polyline_path(
-                    poly.get_points(format='xyb'),
-                    is_closed=True)
-                hatch.associate(hpath, [poly])
-            self._draw_mpl_hatch(gc, path, poly, group_data=group_data)
-
-            if group_data:
-                group = self.drawing.groups.new()
-                group.set_data(group_data)
-        return
+                runs = self._clip_mpl(vertices, clippoly, join=join)
+            else:
+                runs = [vertices]
+            for vertices in runs:
+                close = (rgbFace is not None) or (len(vertices) > 1 and np.array_equal(vertices[0], vertices[-1]))
+                if SIMPLIFY_TOLERANCE:
+                    vertices = simplify_polyline(vertices, SIMPLIFY_TOLERANCE, closed=close)
+                if POLYLINE_MAX_VERTICES is not None and not close and not join:
+                    # long plain lines are split, the last chunk is drawn below
+                    chunks = chunk_polyline(vertices, POLYLINE_MAX_VERTICES)
+                    for chunk in chunks[:-1]:
+                        poly = add_lwpolyline(layout, chunk, dxfattribs=dxfattribs)
+                        poly.set_flag_state(128, True)
+                        self.set_entity_attribs(gc, poly)
+                    vertices = chunks[-1]
+                poly = add_lwpolyline(layout, vertices,
+                                      close=close,
+                                      dxfattribs=dxfattribs)
+                poly.set_flag_state(128, True)
+                self.set_entity_attribs(gc, poly)
+                if join:
+                    boundaries.append((vertices, poly))
+
+        if not boundaries:
+            # nothing of the outline is left to fill
+            for entity in (hatch, pattern_hatch):
+                if entity is not None:
+                    layout.delete_entity(entity)
+            return
+
+        # the rings of a compound path, e.g. a contour level with holes and
+        # islands, are the boundary paths of one HATCH
+        depths = nesting_depths([vertices for vertices, poly in boundaries])
+        for (vertices, poly), depth in zip(boundaries, depths):
+            flags = BOUNDARY_PATH_DEFAULT if depth % 2 else BOUNDARY_PATH_EXTERNAL
+            for entity in (hatch, pattern_hatch):
+                if entity is not None:
+                    hpath = entity.paths.add_polyline_path(
+                        poly.get_points(format='xyb'),
+                        is_closed=True, flags=flags)
+                    entity.associate(hpath, [poly])
+        if pattern_hatch is None and not HATCH_LINES_DRAW_AS_PAT:
+            self._draw_mpl_hatch(gc, path, [vertices for vertices, poly in boundaries],
+                                 group_data=group_data, layout=layout)
+
+        # groups are not needed for the entities of a block and
+        # cannot refer to entities that are already streamed out
+        if group_data and layout is self.modelspace and self._spool is None:
+            group = self.drawing.groups.new()
+            self._count('groups')
+            group.set_data(group_data)
+            if self._record_groups is not None:
+                self._record_groups.append(group)
+
+    def _add_pattern_hatch(self, gc, layout):
+        """Add an empty HATCH filled with the DXF pattern of the matplotlib
+           hatch of ``gc`` to ``layout``, returns None if the hatch has no
+           lines.
+        """
+        hatch_name = gc.get_hatch()
+        definition = get_hatch_pattern(hatch_name, self.dpi * HATCH_SCALE_FACTOR)
+        if not definition:
+            return None
+        attribs = get_color_attribs(gc.get_hatch_color())
+        pattern_hatch = layout.add_hatch(
+            dxfattribs={**attribs, 'lineweight': gc._hatch_lineweight}
+        )
+        self.set_entity_attribs(gc, pattern_hatch)
+        pattern_hatch.set_pattern_fill(
+            name='MPL_%s' % hatch_name.encode().hex().upper(),
+            color=attribs.get('color', 7),
+            definition=definition,
+        )
+        return pattern_hatch
 
-        # hpath = gc.get_hatch_path()
-        # if HATCH_LINES_DRAW_AS_PAT and hpath is not None:
-        #     def hatch_as_pat():
-        #         hatch_name = gc.get_hatch()
-        #         if hatch_name == "'": return
-        #         ext = path.get_extents(transform=transform)
-        #         if (ext.x0 < 0 or ext.x0 > self.width) and (ext.x1 < 0 or ext.x1 > self.width):
-        #             return
-        #         if (ext.y0 < 0 or ext.y0 > self.height) and (ext.y1 < 0 or ext.y1 > self.height):
-        #             return
-        #
-        #         patterns = []
-        #         cx, cy = 0.5 * (ext.x1 + ext.x0), 0.5 * (ext.y1 + ext.y0)
-        #         _transform = Affine2D().translate(-0.5, -0.5).scale(self.dpi).translate(cx, cy)
-        #         hpatht = hpath.transformed(_transform)  # needs clipping
-        #         _path = hpatht.to_polygons(closed_only=False)
-        #
-        #         for vertices in _path:
-        #             if np.array_equal(vertices[0], vertices[-1]):
-        #                 continue
-        #             vertices *= 0.01
-        #             for p0, p1 in pairwise(vertices):
-        #                 pattern = hatchmakerSSIO(p0, p1, dxf_mode=True, return_as_string=False)
-        #                 patterns.append(pattern)
-        #
-        #         patterns = [list(d.values()) for d in patterns]
-        #         if not patterns:
-        #             return
-        #
-        #         hatch = self.modelspace.add_hatch(
-        #             dxfattribs=get_color_attribs(gc.get_hatch_color()) | {
-        #                 'lineweight': self.points_to_pixels(gc.get_hatch_linewidth()) * 10 * 2}
-        #         )
-        #         self.set_entity_attribs(gc, hatch)
-        #         pat_title = clean_pat_title(hatch_name)
-        #         hatch.set_pattern_fill(
-        #             name=f'mpl_{pat_title}',
-        #             scale=100 * HATCH_SCALE_FACTOR,
-        #             definition=patterns,
-        #         )
-        #         hpath_ = hatch.paths.add_polyline_path(
-        #             # get path vertices from associated LWPOLYLINE entity
-        #             poly.get_points(format='xyb'),
-        #             # get closed state also from associated LWPOLYLINE entity
-        #             is_closed=poly.closed)
-        #         hatch.associate(hpath_, [poly])
-        #
-        #     hatch_as_pat()
-
-    def _draw_mpl_hatch(self, gc, path, pline, group_data=None):
-        '''Draw MPL hatch
+    @_timed('_draw_mpl_hatch')
+    def _draw_mpl_hatch(self, gc, path, rings, group_data=None, layout=None):
+        '''Draw MPL hatch inside the closed ``rings`` of the patch
         '''
+        if layout is None:
+            layout = self.modelspace
         hatch = gc.get_hatch()
         if hatch is not None:
             def draw(shape):
                 if hasattr(shape, 'exterior'):
                     is_poly = True
                     clipped = shape.exterior.coords
+                    holes = [interior.coords for interior in shape.interiors]
                 else:
                     is_poly = False
                     clipped = shape.coords
                 if clipped:
                     if is_poly:
-                        entity = self.modelspace.add_hatch(dxfattribs=get_color_attribs(rgb))
-                        entity.paths.add_polyline_path(clipped, is_closed=True)
+                        entity = layout.add_hatch(dxfattribs=get_color_attribs(rgb))
+                        entity.paths.add_polyline_path(clipped, is_closed=True,
+                                                       flags=BOUNDARY_PATH_EXTERNAL)
+                        for hole in holes:
+                            entity.paths.add_polyline_path(hole, is_closed=True)
                     else:
-                        entity = self.modelspace.add_lwpolyline(points=clipped,
-                                                                dxfattribs=get_color_attribs(rgb) | {
-                                                                    'lineweight': gc._hatch_lineweight}
-                                                                )
+                        entity = layout.add_lwpolyline(points=clipped,
+                                                       dxfattribs=get_color_attribs(rgb) | {
+                                                           'lineweight': gc._hatch_lineweight}
+                                                       )
                         entity.set_flag_state(128, True)
                     if group_data is not None:
                         group_data.append(entity)
@@ -401,52 +988,18 @@ class RendererDXF(RendererBase):
             _transform = Affine2D().translate(-0.5, -0.5).scale(self.dpi * HATCH_SCALE_FACTOR).translate(cx, cy)
             hpatht = hpath.transformed(_transform)
 
-            # print("\tHatch Path:", hpatht)
-            # now place the hatch to cover the parent path
-            for irow in range(-rows, rows + 1):
-                for icol in range(-cols, cols + 1):
-                    # transformation from the center of the parent path
-                    _trans = Affine2D().translate(icol * self.dpi * HATCH_SCALE_FACTOR,
-                                                  irow * self.dpi * HATCH_SCALE_FACTOR)
-                    # transformed hatch
-                    _hpath = hpatht.transformed(_trans)
-
-                    # turn into list of vertices to make up polygon
-                    _path = _hpath.to_polygons(closed_only=HATCH_LINES_DRAW_AS_PAT)
-
-                    for vertices in _path:
-                        # clip each set to the parent path
-                        if len(vertices) < 2:
-                            continue
-                        vertices_is_closed = np.array_equal(vertices[0], vertices[-1])
-                        try:
-                            clippoly = Polygon(pline.vertices())
-                        except ValueError:
-                            # when not enough points for Polygon
-                            continue
-                        if vertices_is_closed:
-                            shape = Polygon(vertices)
-                        else:
-                            shape = LineString(vertices)
-                        if not shape.is_valid:
-                            continue
-                        if not clippoly.contains(shape) and not clippoly.intersects(shape):
-                            # ignore shape when shape is completely outside clippoly,
-                            # prevents intersection invalid warning
-                            continue
-                        if shape.is_simple:
-                            try:
-                                shape = shape.intersection(clippoly)
-                            except GEOSException as e:
-                                continue
-                        if shape.geom_type in ['Polygon', 'LineString']:
-                            draw(shape)
-                        elif shape.geom_type == 'MultiPolygon':
-                            for shape_ in list(shape.geoms):
-                                draw(shape_)
-                        else:
-                            pass
+            # now place the hatch to cover the parent path, the whole grid of
+            # tiles is built and clipped in one go
+            clippoly = even_odd_polygon(rings)
+            if clippoly.is_empty:
+                # when not enough points for Polygon
+                return
+            for shape in tile_hatch(hpatht.to_polygons(closed_only=False),
+                                    rows, cols, self.dpi * HATCH_SCALE_FACTOR, clippoly):
+                draw(shape)
 
+    @_timed('draw_path')
+    @_incremental
     def draw_path(self, gc, path, transform, rgbFace=None):
         # print('\nEntered ###DRAW_PATH###')
         # print('\t', self._groupd)
@@ -457,11 +1010,372 @@ class RendererDXF(RendererBase):
         # if hatch is not None:
         #     print('\tHatch Path', gc.get_hatch_path().__dict__)
         self.check_gc(gc)
+        if (DECIMATE_MIN_VERTICES is not None and rgbFace is None and gc.get_hatch() is None
+                and path.codes is None and len(path.vertices) > DECIMATE_MIN_VERTICES):
+            path, transform = self._decimate(path, transform)
         self._draw_mpl_patch(gc, path, transform, rgbFace, obj=self._groupd[-1])
+        self._check_spool()
 
+    def _decimate(self, path, transform):
+        """Return the path and transform to draw a line of many vertices
+           with, decimated if its x values are monotonic and finite.
+        """
+        vertices = transform.transform(path.vertices)
+        dx = np.diff(vertices[:, 0])
+        if not np.isfinite(vertices).all() or not ((dx >= 0).all() or (dx <= 0).all()):
+            return path, transform
+        return Path(decimate_minmax(vertices, DECIMATE_BIN_WIDTH)), IdentityTransform()
+
+    def _get_marker_block(self, gc, marker_path, marker_trans, rgbFace):
+        """Return the name of the BLOCK drawing ``marker_path`` with the
+           style of ``gc``, defining it the first time it is needed.
+        """
+        hatch_color = gc.get_hatch_color() if gc.get_hatch() is not None else None
+        key = (
+            marker_path.vertices.tobytes(),
+            None if marker_path.codes is None else marker_path.codes.tobytes(),
+            marker_trans.get_matrix().tobytes(),
+            None if rgbFace is None else tuple(np.asarray(rgbFace, float)),
+            tuple(gc.get_rgb()), gc._lineweight, gc._linetype, gc._transparency,
+            gc.get_hatch(), None if hatch_color is None else tuple(hatch_color),
+            gc._hatch_lineweight,
+        )
+        try:
+            return self._marker_blocks[key]
+        except KeyError:
+            pass
+        # a name derived from the style, so equal markers share their block
+        name = 'MPL_MARKER_%s' % hashlib.sha1(repr(key).encode()).hexdigest()[:16].upper()
+        if name not in self.drawing.blocks:
+            block = self.drawing.blocks.new(name=name)
+            self._count('blocks')
+            # the marker is drawn around the block origin, clipping is done
+            # per marker position in draw_markers
+            block_gc = self.new_gc()
+            block_gc.copy_properties(gc)
+            block_gc.set_clip_rectangle(None)
+            block_gc.set_clip_path(None)
+            self.check_gc(block_gc)
+            self._draw_mpl_patch(block_gc, marker_path, marker_trans, rgbFace, layout=block)
+            block_gc.restore()
+        self._marker_blocks[key] = name
+        return name
+
+    def _clip_markers(self, gc, points, extents):
+        """Return boolean masks of the (n, 2) ``points`` whose marker lies
+           fully inside the clip box of ``gc`` and of those whose marker
+           crosses it. ``extents`` are the (n, 4) ``x0, y0, x1, y1`` extents
+           of the markers relative to their point.
+        """
+        finite = np.isfinite(points).all(axis=1)
+        bbox = gc.get_clip_rectangle()
+        if bbox is None:
+            return finite, np.zeros(len(points), bool)
+        x0, x1 = sorted((bbox.x0, bbox.x1))
+        y0, y1 = sorted((bbox.y0, bbox.y1))
+        (mx0, my0), (mx1, my1) = (points + extents[:, :2]).T, (points + extents[:, 2:]).T
+        inside = finite & (mx0 >= x0) & (mx1 <= x1) & (my0 >= y0) & (my1 <= y1)
+        overlaps = finite & ~((mx0 > x1) | (mx1 < x0) | (my0 > y1) | (my1 < y0))
+        return inside, overlaps & ~inside
+
+    @_timed('draw_markers')
+    @_incremental
+    def draw_markers(self, gc, marker_path, marker_trans, path, trans, rgbFace=None):
+        # each marker style is drawn once into a BLOCK and referenced by an
+        # INSERT at every vertex of path
+        if path.codes is None:
+            points = trans.transform(path.vertices)
+        else:
+            points = np.array([vertices[-2:] for vertices, code
+                               in path.iter_segments(trans, simplify=False)
+                               if len(vertices)], float).reshape(-1, 2)
+        # markers outside the clip box are culled, the few that cross it are
+        # drawn and clipped one by one
+        extents = np.tile(marker_path.get_extents(marker_trans).extents, (len(points), 1))
+        inside, crossing = self._clip_markers(gc, points, extents)
+        if not (inside.any() or crossing.any()):
+            return
+        self.check_gc(gc)
+        name = self._get_marker_block(gc, marker_path, marker_trans, rgbFace) if inside.any() else None
+        for i in np.flatnonzero(inside | crossing).tolist():
+            x, y = points[i].tolist()
+            if inside[i]:
+                self.modelspace.add_blockref(name, (x, y))
+            else:
+                self._draw_mpl_patch(gc, marker_path, marker_trans + Affine2D().translate(x, y),
+                                     rgbFace, obj=self._groupd[-1])
+            self._check_spool()
+
+    def _collection_styles(self, gc, n, facecolors, edgecolors, linewidths, linestyles):
+        """Resolve the styles of the ``n`` elements of a path collection.
+
+           Returns the array of style indices of the elements and the list
+           of ``(gc, rgbFace)`` of the distinct styles, ``check_gc`` is done
+           once per style. The rules are the ones of
+           ``RendererBase._iter_collection``.
+        """
+        index = np.arange(n)
+
+        def column(values, width):
+            # cycled values of every element, -1 where the collection has none
+            if not len(values):
+                return np.full((n, width), -1.)
+            values = np.asarray(values, float).reshape(len(values), width)
+            return values[index % len(values)]
+
+        rows = np.hstack([
+            column(facecolors, 4),
+            column(edgecolors, 4),
+            column(linewidths, 1),
+            column(np.arange(len(linestyles)), 1),
+        ])
+        unique_rows, style_index = np.unique(rows, axis=0, return_inverse=True)
+
+        styles = []
+        for row in unique_rows.tolist():
+            fc, ec, lw, ls = row[:4], row[4:8], row[8], int(row[9])
+            gc0 = self.new_gc()
+            gc0.copy_properties(gc)
+            if fc[0] < 0 or fc[3] == 0:
+                fc = None
+            if ec[0] < 0:
+                gc0.set_linewidth(0.0)
+            else:
+                if lw >= 0:
+                    gc0.set_linewidth(lw)
+                if ls >= 0:
+                    gc0.set_dashes(*linestyles[ls])
+                if ec[3] == 0.0:
+                    gc0.set_linewidth(0)
+                else:
+                    gc0.set_foreground(ec)
+            self.check_gc(gc0)
+            styles.append((gc0, fc))
+        return style_index.ravel(), styles
+
+    @_timed('draw_path_collection')
+    @_incremental
+    def draw_path_collection(self, gc, master_transform, paths, all_transforms,
+                             offsets, offset_trans, facecolors, edgecolors,
+                             linewidths, linestyles, antialiaseds, urls,
+                             offset_position):
+        # styles are resolved once for the whole collection; a path that is
+        # repeated with the same style at many offsets (e.g. scatter) is
+        # drawn once into a block and inserted, like markers
+        path_ids = list(self._iter_collection_raw_paths(master_transform, paths, all_transforms))
+        n_paths = len(path_ids)
+        n_offsets = len(offsets)
+        n = max(n_paths, n_offsets)
+        if (len(facecolors) == 0 and len(edgecolors) == 0) or n_paths == 0:
+            return
+
+        if n_offsets:
+            points = offset_trans.transform(offsets)[np.arange(n) % n_offsets]
+        else:
+            points = np.zeros((n, 2))
+        path_index = np.arange(n) % n_paths
+        style_index, styles = self._collection_styles(
+            gc, n, facecolors, edgecolors, linewidths, linestyles)
+
+        uses = self._iter_collection_uses_per_path(paths, all_transforms, offsets,
+                                                   facecolors, edgecolors)
+        combos = np.unique(path_index * len(styles) + style_index)
+        if n_offsets and uses > 1 and 2 * len(combos) <= n:
+            # elements outside the clip box are culled, the few that cross
+            # it are drawn and clipped like below
+            extents = np.array([path.get_extents(transform).extents
+                                for path, transform in path_ids])[path_index]
+            inside, crossing = self._clip_markers(gc, points, extents)
+            blocks = {}
+            for i in np.flatnonzero(inside | crossing).tolist():
+                key = path_index[i], style_index[i]
+                path, transform = path_ids[key[0]]
+                gc0, fc = styles[key[1]]
+                if crossing[i]:
+                    transform = transform.frozen()
+                    transform.translate(*points[i])
+                    self._draw_mpl_patch(gc0, path, transform, fc, obj=self._groupd[-1])
+                else:
+                    try:
+                        name = blocks[key]
+                    except KeyError:
+                        name = blocks[key] = self._get_marker_block(gc0, path, transform, fc)
+                    self.modelspace.add_blockref(name, points[i])
+                self._check_spool()
+        else:
+            for i in np.flatnonzero(np.isfinite(points).all(axis=1)).tolist():
+                path, transform = path_ids[path_index[i]]
+                xo, yo = points[i]
+                if xo != 0 or yo != 0:
+                    transform = transform.frozen()
+                    transform.translate(xo, yo)
+                gc0, fc = styles[style_index[i]]
+                self._draw_mpl_patch(gc0, path, transform, fc, obj=self._groupd[-1])
+                self._check_spool()
+
+        for gc0, fc in styles:
+            gc0.restore()
+
+    def _draw_solids(self, gc, quads, colors):
+        """Draw the (n, 4, 2) array of quadrilaterals ``quads`` filled with
+           the (n, 4) RGBA ``colors`` as SOLID entities.
+
+           Quads outside the clip box are culled, the few that cross it are
+           clipped and drawn as solid fill hatches.
+        """
+        colors = np.asarray(colors, float)
+        alpha = colors[:, 3]
+        if gc.get_forced_alpha():
+            alpha = np.full(len(colors), gc.get_alpha())
+        visible = np.isfinite(quads).all(axis=(1, 2)) & (alpha > 0)
+        crossing = np.zeros(len(quads), bool)
+        bbox = gc.get_clip_rectangle()
+        if bbox is not None:
+            x0, x1 = sorted((bbox.x0, bbox.x1))
+            y0, y1 = sorted((bbox.y0, bbox.y1))
+            (ex0, ey0), (ex1, ey1) = quads.min(axis=1).T, quads.max(axis=1).T
+            visible &= ~((ex0 > x1) | (ex1 < x0) | (ey0 > y1) | (ey1 < y0))
+            # cells on the edge of the clip box often overshoot it by float
+            # noise only, those are drawn as solids as well
+            eps = 1e-6
+            crossing = visible & ~((ex0 >= x0 - eps) & (ex1 <= x1 + eps)
+                                   & (ey0 >= y0 - eps) & (ey1 <= y1 + eps))
+
+        true_colors = get_true_colors(colors)
+
+        def color_attribs(i):
+            if true_colors[i] < 0:
+                return {'color': 7}
+            return {'true_color': int(true_colors[i])}
+
+        for i in np.flatnonzero(visible & ~crossing).tolist():
+            q = quads[i]
+            # the vertex order of a SOLID is zig-zag
+            solid = self.modelspace.add_solid([q[0], q[1], q[3], q[2]], dxfattribs=color_attribs(i))
+            if alpha[i] < 1:
+                solid.transparency = 1 - alpha[i]
+            self._check_spool()
+
+        crossing = np.flatnonzero(crossing)
+        if len(crossing):
+            for i, parts in zip(crossing.tolist(), clip_polygons(quads[crossing], (x0, y0, x1, y1))):
+                for vertices in parts:
+                    hatch = self.modelspace.add_hatch(dxfattribs=color_attribs(i))
+                    hatch.paths.add_polyline_path(vertices, is_closed=True)
+                    if alpha[i] < 1:
+                        hatch.transparency = 1 - alpha[i]
+                    self._check_spool()
+
+    @_timed('draw_quad_mesh')
+    @_incremental
+    def draw_quad_mesh(self, gc, master_transform, meshWidth, meshHeight,
+                       coordinates, offsets, offsetTrans, facecolors,
+                       antialiased, edgecolors):
+        # cells are drawn as SOLID entities, visible edges as a path collection
+        coordinates = master_transform.transform(
+            np.asarray(coordinates, float).reshape(-1, 2)).reshape(meshHeight + 1, meshWidth + 1, 2)
+        quads = np.stack([
+            coordinates[:-1, :-1], coordinates[:-1, 1:],
+            coordinates[1:, 1:], coordinates[1:, :-1],
+        ], axis=2).reshape(-1, 4, 2)
+        if len(offsets):
+            offsets = offsetTrans.transform(offsets)
+            quads = quads + offsets[np.arange(len(quads)) % len(offsets), None, :]
+        facecolors = np.asarray(facecolors, float).reshape(-1, 4)
+        if len(facecolors):
+            self._draw_solids(gc, quads, facecolors[np.arange(len(quads)) % len(facecolors)])
+
+        if edgecolors is None:
+            edgecolors = facecolors
+        if len(edgecolors) and gc.get_linewidth() > 0:
+            from matplotlib.collections import QuadMesh
+            paths = QuadMesh._convert_mesh_to_paths(coordinates)
+            self.draw_path_collection(
+                gc, Affine2D(), paths, [], offsets, Affine2D(), [], edgecolors,
+                np.array([gc.get_linewidth()], float), [], [antialiased], [None], 'screen')
+
+    @_timed('draw_gouraud_triangles')
+    @_incremental
+    def draw_gouraud_triangles(self, gc, triangles_array, colors_array, transform):
+        # DXF has no gradient fills for triangles, each one is drawn as a
+        # SOLID with the mean colour of its vertices
+        triangles = transform.transform(
+            np.asarray(triangles_array, float).reshape(-1, 2)).reshape(-1, 3, 2)
+        quads = np.concatenate([triangles, triangles[:, 2:]], axis=1)
+        colors = np.asarray(colors_array, float).mean(axis=1)
+        self._draw_solids(gc, quads, colors)
+
+    def get_image_magnification(self):
+        # matplotlib resamples images to the IMAGE_DPI resolution for us
+        if IMAGE_DPI is None:
+            return 1.0
+        return IMAGE_DPI / self.dpi
+
+    def _get_image_def(self, im):
+        """Return the IMAGEDEF of the RGBA array ``im``, adding it and the PNG
+           data to ``images`` if the same image was not drawn before.
+        """
+        key = hashlib.sha1(b'%d,%d,' % im.shape[:2] + im.tobytes()).hexdigest()
+        try:
+            return self._image_defs[key]
+        except KeyError:
+            pass
+        height, width = im.shape[:2]
+        if (im[..., 3] == 255).all():
+            # no need to store the alpha channel of opaque images
+            im = im[..., :3]
+        data = io.BytesIO()
+        Image.fromarray(im).save(data, format='png')
+        filename = 'mpldxf-%s.png' % key[:16]
+        self.images[filename] = data.getvalue()
+        image_def = self.drawing.add_image_def(filename=filename, size_in_pixel=(width, height))
+        self._image_defs[key] = image_def
+        return image_def
+
+    @_timed('draw_image')
+    @_incremental
     def draw_image(self, gc, x, y, im, transform=None):
-        pass
-
+        # the image is drawn as an IMAGE referencing a PNG file, identical
+        # images share their file
+        height, width = im.shape[:2]
+        if not height or not width:
+            return
+        scale = 1 / self.get_image_magnification()
+        x1, y1 = x + width * scale, y + height * scale
+        bbox = gc.get_clip_rectangle()
+        if bbox is not None:
+            cx0, cx1 = sorted((bbox.x0, bbox.x1))
+            cy0, cy1 = sorted((bbox.y0, bbox.y1))
+            if x > cx1 or x1 < cx0 or y > cy1 or y1 < cy0:
+                return
+        self.check_gc(gc)
+        # the rows of im are bottom up, PNG files are top down
+        image_def = self._get_image_def(np.asarray(im)[::-1])
+        image = self.modelspace.add_image(image_def, insert=(x, y),
+                                          size_in_units=(width * scale, height * scale))
+        self.set_entity_attribs(gc, image)
+        eps = 1e-6
+        if bbox is not None and (x < cx0 - eps or x1 > cx1 + eps or y < cy0 - eps or y1 > cy1 + eps):
+            # clipping boundary in pixels, the origin of the boundary is the
+            # center of the top left pixel
+            px0, px1 = (max(x, cx0) - x) / scale - 0.5, (min(x1, cx1) - x) / scale - 0.5
+            py0, py1 = (y1 - min(y1, cy1)) / scale - 0.5, (y1 - max(y, cy0)) / scale - 0.5
+            image.set_boundary_path([(px0, py0), (px1, py0), (px1, py1), (px0, py1)])
+        self._check_spool()
+
+    def write_images(self, dirname):
+        """Write the PNG files of the raster images to ``dirname``, images
+           are only referenced by the drawing so they have to be next to the
+           DXF file. Existing files are kept, their names are content hashes.
+        """
+        for filename, data in self.images.items():
+            path = os.path.join(dirname, filename)
+            if not os.path.exists(path):
+                with open(path, 'wb') as fh:
+                    fh.write(data)
+
+    @_timed('draw_text')
+    @_incremental
     def draw_text(self, gc, x, y, s, prop, angle, ismath=False, mtext=None):
         # print('DXF draw_text', s)
         # print(x * 72 / 100, y * 72 / 100, s, mtext)
@@ -486,17 +1400,10 @@ class RendererDXF(RendererBase):
                 return
 
         if ismath:
-            width, height, descent, glyphs, rects = \
-                self._text2path.mathtext_parser.parse(s, 72, prop)
-            s_parsed = ''
-            fontsize_prev = None
-            for font, fontsize, num, ox, oy in glyphs:
-                s_parsed_current = chr(num)
-                if fontsize_prev is not None and fontsize < fontsize_prev:
-                    DIGITS = dict(zip(u"0123456789", u"⁰¹²³⁴⁵⁶⁷⁸⁹"))
-                    s_parsed_current = DIGITS.get(s_parsed_current, s_parsed_current)
-                s_parsed += s_parsed_current
-                fontsize_prev = fontsize
+            key = (s, _font_key(prop))
+            s_parsed = mathtext_cache.get(key)
+            if s_parsed is None:
+                s_parsed = mathtext_cache[key] = self._flatten_mathtext(s, prop)
             s = s_parsed
 
         # print('\nEntered ###DRAW_TEXT###')
@@ -505,7 +1412,7 @@ class RendererDXF(RendererBase):
 
         # fontsize = self.points_to_pixels(prop.get_size_in_points()) original
         fontsize = prop.get_size_in_points()
-        fontname = os.path.basename(font_manager.findfont(prop))
+        fontname = self._get_text_style(prop)
         # s = s.replace(u"\u2212", "-")
         s.encode('ascii', 'ignore').decode()
         text = self.modelspace.add_text(s, height=fontsize, rotation=angle, dxfattribs={
@@ -531,8 +1438,27 @@ class RendererDXF(RendererBase):
 
         p1 = x, y
         text.set_placement(p1, align=align)
+        self._check_spool()
         # print('Left ###TEXT###')
 
+    def _flatten_mathtext(self, s, prop):
+        """Return the mathtext ``s`` as plain text, smaller digits following
+           larger glyphs (e.g. the exponent of ``$10^{3}$``) become
+           superscripts.
+        """
+        width, height, descent, glyphs, rects = \
+            self._text2path.mathtext_parser.parse(s, 72, prop)
+        s_parsed = ''
+        fontsize_prev = None
+        for font, fontsize, num, ox, oy in glyphs:
+            s_parsed_current = chr(num)
+            if fontsize_prev is not None and fontsize < fontsize_prev:
+                DIGITS = dict(zip(u"0123456789", u"⁰¹²³⁴⁵⁶⁷⁸⁹"))
+                s_parsed_current = DIGITS.get(s_parsed_current, s_parsed_current)
+            s_parsed += s_parsed_current
+            fontsize_prev = fontsize
+        return s_parsed
+
     def _map_align(self, align, vert=False):
         """Translate a matplotlib text alignment to the ezdxf alignment."""
         if align in ['right', 'center', 'left', 'top',
@@ -552,9 +1478,17 @@ class RendererDXF(RendererBase):
     def open_group(self, s, gid=None):
         # docstring inherited
         self._groupd.append(s)
+        if self._draw_records is not None:
+            counter = self._group_counters[-1]
+            self._group_keys.append(self._group_keys[-1] + ((s, gid, counter[s, gid]),))
+            counter[s, gid] += 1
+            self._group_counters.append(collections.Counter())
 
     def close_group(self, s):
         self._groupd.pop(-1)
+        if self._draw_records is not None:
+            self._group_keys.pop(-1)
+            self._group_counters.pop(-1)
 
     def flipy(self):
         return False
@@ -566,6 +1500,13 @@ class RendererDXF(RendererBase):
     #     return points / 72.0 * self.dpi
 
     def get_text_width_height_descent(self, s, prop, ismath):
+        key = (s, _font_key(prop), self.dpi, ismath)
+        metrics = text_metrics_cache.get(key)
+        if metrics is None:
+            metrics = text_metrics_cache[key] = self._text_width_height_descent(s, prop)
+        return metrics
+
+    def _text_width_height_descent(self, s, prop):
         font = self._get_font_ttf(prop)
         font.set_text(s, 0.0, flags=2)
         w, h = font.get_width_height()
@@ -585,6 +1526,11 @@ class RendererDXF(RendererBase):
         return font
 
 
+#: The renderer of the last incremental draw of every figure, ``savefig``
+#: creates a new canvas for every call
+_incremental_renderers = weakref.WeakKeyDictionary()
+
+
 class FigureCanvasDXF(FigureCanvasBase):
     """
     A canvas to use the renderer. This only implements enough of the
@@ -595,13 +1541,16 @@ class FigureCanvasDXF(FigureCanvasBase):
     #: supported by ezdxf if desired.
     DXFVERSION = 'AC1032'
 
-    def get_dxf_renderer(self, cleared=False):
+    def get_dxf_renderer(self, cleared=False, incremental=False):
         """Get a renderer to use. Will create a new one if we don't
            alreadty have one or if the figure dimensions or resolution have
-           changed.
+           changed. With ``incremental=True`` the renderer of the last
+           incremental draw of the figure is used, whatever its canvas.
         """
         l, b, w, h = self.figure.bbox.bounds
         key = w, h, self.figure.dpi
+        if incremental and self.figure in _incremental_renderers:
+            self._lastKey, self.dxf_renderer = _incremental_renderers[self.figure]
         try:
             self._lastKey, self.dxf_renderer
         except AttributeError:
@@ -615,34 +1564,186 @@ class FigureCanvasDXF(FigureCanvasBase):
             self._lastKey = key
         elif cleared:
             self.dxf_renderer.clear()
+        if incremental:
+            _incremental_renderers[self.figure] = self._lastKey, self.dxf_renderer
         return self.dxf_renderer
 
-    def draw(self):
+    def draw(self, incremental=False):
         """
-        Draw the figure using the renderer
+        Draw the figure using the renderer.
+
+        With ``incremental=True`` only the artists that changed since the
+        last incremental draw are drawn again, see
+        ``RendererDXF.start_incremental``.
         """
-        renderer = self.get_dxf_renderer()
-        self.figure.draw(renderer)
+        if incremental:
+            renderer = self.get_dxf_renderer(incremental=True)
+            renderer.start_incremental()
+            self.figure.draw(renderer)
+            renderer.finish_incremental()
+        else:
+            renderer = self.get_dxf_renderer(cleared=True)
+            self.figure.draw(renderer)
         return renderer.drawing
 
     # Add DXF to the class-scope filetypes dictionary
-    filetypes = {**FigureCanvasBase.filetypes, 'dxf': 'Drawing Exchange Format'}
+    filetypes = {**FigureCanvasBase.filetypes,
+                 'dxf': 'Drawing Exchange Format',
+                 'dxfz': 'Drawing Exchange Format (gzip compressed)'}
 
-    def print_dxf(self, filename, *args, **kwargs):
+    def print_dxf(self, filename, *args, streaming=False, fmt='asc', compression=None,
+                  incremental=False, stats=None, **kwargs):
         """
         Write out a DXF file.
+
+        ``filename`` is a path, a text stream or any binary file-like object
+        (e.g. ``BytesIO``, a socket file or an HTTP response body), nothing
+        is written to temporary files. Use ``fmt='bin'`` for binary DXF,
+        which is smaller and faster to read and write, and ``compression``
+        ``'gzip'`` or ``'zip'`` to compress the output on the fly. Binary
+        and compressed output need a path or a binary file object.
+
+        With ``streaming=True`` the entities are written to a temporary file
+        while the figure is drawn, so memory use does not grow with the
+        number of entities, see ``RendererDXF.start_streaming``.
+
+        With ``incremental=True`` the entities of the previous incremental
+        export of the figure are kept and only the artists that changed are
+        drawn again, which is much faster for small edits of a large figure.
+
+        Pass a ``RenderStats`` as ``stats`` to collect the time spent in the
+        renderer methods and the number of entities and resources created,
+        they are also logged at INFO level.
         """
-        import io
-        drawing = self.draw()
-        if isinstance(filename, io.StringIO):
-            drawing.write(filename)
-        else:
-            drawing.saveas(filename)
+        if streaming and incremental:
+            raise ValueError('Streaming and incremental export cannot be combined')
+        start = time.perf_counter()
+        renderer = self.get_dxf_renderer(incremental=incremental)
+        renderer.stats = stats
+        try:
+            with _open_dxf_output(filename, fmt, compression,
+                                  renderer.drawing.output_encoding) as fh:
+                if streaming:
+                    self.get_dxf_renderer(cleared=True)
+                    renderer.start_streaming(fmt)
+                    self.figure.draw(renderer)
+                    write_start = time.perf_counter()
+                    renderer.write_streamed(fh)
+                else:
+                    self.draw(incremental)
+                    write_start = time.perf_counter()
+                    renderer.drawing.write(fh, fmt=fmt)
+            _write_dxf_images(renderer, filename)
+        finally:
+            renderer.stats = None
+        if stats is not None:
+            end = time.perf_counter()
+            stats.add_time('write', end - write_start)
+            stats.add_time('print_dxf', end - start)
+            stats.entities.update(e.dxftype() for e in renderer.modelspace)
+            _log.info('DXF export of %s:\n%s', filename, stats)
+
+    def print_dxfz(self, filename, *args, **kwargs):
+        """
+        Write out a gzip compressed DXF file.
+        """
+        return self.print_dxf(filename, *args, compression='gzip', **kwargs)
 
     def get_default_filetype(self):
         return 'dxf'
 
 
+@contextlib.contextmanager
+def _open_dxf_output(filename, fmt, compression, encoding):
+    """Open the output of ``print_dxf``, yields a text stream for ASCII DXF
+       in the output ``encoding`` of the drawing and a binary stream for
+       binary DXF.
+    """
+    if fmt not in ('asc', 'bin'):
+        raise ValueError("Unknown output format: '%s'" % fmt)
+    if compression not in (None, 'gzip', 'zip'):
+        raise ValueError("Unknown compression: '%s'" % compression)
+    if isinstance(filename, io.TextIOBase):
+        if fmt != 'asc' or compression is not None:
+            raise ValueError('Binary or compressed DXF needs a binary file object')
+        yield filename
+        return
+    with contextlib.ExitStack() as stack:
+        fh = stack.enter_context(cbook.open_file_cm(filename, 'wb'))
+        if compression == 'gzip':
+            fh = stack.enter_context(gzip.GzipFile(mode='wb', fileobj=fh))
+        elif compression == 'zip':
+            name = 'figure'
+            if isinstance(filename, (str, os.PathLike)):
+                name = os.path.splitext(os.path.basename(filename))[0]
+            zip_file = stack.enter_context(zipfile.ZipFile(fh, 'w', zipfile.ZIP_DEFLATED))
+            fh = stack.enter_context(zip_file.open(name + '.dxf', 'w'))
+        if fmt == 'bin':
+            yield fh
+        else:
+            # ASCII DXF to a binary stream, encoded like Drawing.saveas does
+            text_fh = io.TextIOWrapper(fh, encoding=encoding, errors='dxfreplace')
+            try:
+                yield text_fh
+            finally:
+                # leave the underlying stream open for the caller
+                text_fh.flush()
+                text_fh.detach()
+
+
+def _write_dxf_images(renderer, filename):
+    """Write the raster images of ``renderer`` next to the DXF file."""
+    if not renderer.images:
+        return
+    if isinstance(filename, (str, os.PathLike)):
+        renderer.write_images(os.path.dirname(os.path.abspath(filename)))
+    else:
+        _log.warning('Raster images are not written when saving to a '
+                     'file object, use RendererDXF.write_images')
+
+
+def draw_figures(figures, names=None, dxfversion=FigureCanvasDXF.DXFVERSION):
+    """Draw ``figures`` into one drawing and return the renderer.
+
+       Every figure gets its own paperspace layout, named by ``names`` or
+       'Figure 1', 'Figure 2', ..., with a viewport showing it. The figures
+       are placed next to each other in the modelspace and share the
+       tables and block definitions.
+    """
+    figures = list(figures)
+    if names is None:
+        names = ['Figure %d' % (i + 1) for i in range(len(figures))]
+    elif len(names) != len(figures):
+        raise ValueError('Need one name per figure')
+    renderer = None
+    for figure, name in zip(figures, names):
+        l, b, w, h = figure.bbox.bounds
+        if renderer is None:
+            renderer = RendererDXF(w, h, figure.dpi, dxfversion)
+            renderer.drawing.layouts.rename('Layout1', name)
+        else:
+            renderer.start_page(w, h, figure.dpi, name)
+        figure.draw(renderer)
+        renderer.finish_page()
+    if renderer is None:
+        raise ValueError('No figures to draw')
+    return renderer
+
+
+def save_figures(figures, filename, names=None, fmt='asc', compression=None):
+    """Save ``figures`` to a single DXF file with one paperspace layout per
+       figure, see ``draw_figures``. ``filename``, ``fmt`` and
+       ``compression`` are the same as for ``FigureCanvasDXF.print_dxf``.
+
+       Report packs with many pages are much smaller and faster to open
+       than one file per figure with its own copy of all tables.
+    """
+    renderer = draw_figures(figures, names)
+    with _open_dxf_output(filename, fmt, compression, renderer.drawing.output_encoding) as fh:
+        renderer.drawing.write(fh, fmt=fmt)
+    _write_dxf_images(renderer, filename)
+
+
 @_Backend.export
 class _BackendDXF(_Backend):
     FigureCanvas = FigureCanvasDXF
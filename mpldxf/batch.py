@@ -0,0 +1,139 @@
+"""
+Export many figures to DXF in parallel.
+
+Figures are rendered in a pool of worker processes, so the throughput of
+nightly exports scales with the number of cores:
+
+  from mpldxf.batch import export_figures
+
+  results = export_figures([(make_plot, 'plot.dxf'),
+                            ('figure.pickle', 'figure.dxf')])
+
+A figure source is a figure factory (a picklable callable without arguments
+returning a ``Figure``, e.g. a module level function), a ``Figure`` or the
+path of a pickled figure. Each worker loads the font index and the drawing
+templates once, so only the first figure of a worker pays for them.
+
+Failures do not stop the batch, they are reported in the results together
+with the time and number of entities of every figure. The same is available
+from the command line, see ``python -m mpldxf --help``.
+"""
+
+import collections
+import concurrent.futures
+import logging
+import os
+import pickle
+import time
+import traceback
+
+import matplotlib
+from matplotlib import pyplot as plt
+from matplotlib.figure import Figure
+
+from mpldxf.backend_dxf import FigureCanvasDXF, new_drawing
+from mpldxf.font_index import get_ttf_files
+
+_log = logging.getLogger(__name__)
+
+#: The result of exporting one figure. ``error`` is None on success and the
+#: formatted traceback of a failed export otherwise.
+BatchResult = collections.namedtuple('BatchResult', 'source filename seconds entities error')
+
+
+def _warm_caches():
+    """Warm the per-process caches before the first figure is exported."""
+    get_ttf_files()
+    new_drawing(FigureCanvasDXF.DXFVERSION)
+
+
+def _init_worker():
+    """Set up a worker process of the pool."""
+    matplotlib.use('agg')
+    _warm_caches()
+
+
+def load_figure(source):
+    """Return the figure of a figure factory, a figure or a pickled figure."""
+    if isinstance(source, Figure):
+        return source
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as fh:
+            figure = pickle.load(fh)
+    elif callable(source):
+        figure = source()
+    else:
+        raise TypeError('Not a figure source: %r' % (source,))
+    if not isinstance(figure, Figure):
+        raise TypeError('%r did not give a figure but %r' % (source, figure))
+    return figure
+
+
+def _source_name(source):
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source)
+    return getattr(source, '__qualname__', repr(source))
+
+
+def export_figure(source, filename, **kwargs):
+    """Export the figure of ``source`` to ``filename`` and return its
+       ``BatchResult``. Keyword arguments are passed to ``print_dxf``.
+    """
+    start = time.perf_counter()
+    figure = original_canvas = None
+    try:
+        figure = load_figure(source)
+        original_canvas = figure.canvas
+        canvas = FigureCanvasDXF(figure)
+        canvas.print_dxf(filename, **kwargs)
+        renderer = canvas.dxf_renderer
+        entities = len(renderer.modelspace) + renderer.streamed_entities
+        error = None
+    except Exception:
+        entities = None
+        error = traceback.format_exc()
+    finally:
+        if figure is source:
+            # a figure of the caller is left as it was
+            figure.set_canvas(original_canvas)
+        elif figure is not None:
+            # pyplot keeps figures made by factories alive otherwise
+            plt.close(figure)
+    return BatchResult(_source_name(source), filename, time.perf_counter() - start,
+                       entities, error)
+
+
+def export_figures(jobs, processes=None, **kwargs):
+    """Export figures to DXF in a pool of ``processes`` worker processes.
+
+       ``jobs`` is an iterable of ``(source, filename)`` pairs, see the
+       module docstring for the figure sources. ``processes`` defaults to
+       the number of cores, with ``processes=1`` the figures are exported in
+       the calling process. Keyword arguments are passed to ``print_dxf``.
+
+       Returns the list of ``BatchResult`` in the order of ``jobs``.
+    """
+    jobs = list(jobs)
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = max(1, min(processes, len(jobs)))
+    if processes == 1:
+        # the backend of the calling process is left alone
+        _warm_caches()
+        results = [export_figure(source, filename, **kwargs) for source, filename in jobs]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(processes, initializer=_init_worker) as pool:
+            futures = [pool.submit(export_figure, source, filename, **kwargs)
+                       for source, filename in jobs]
+            results = []
+            for (source, filename), future in zip(jobs, futures):
+                try:
+                    results.append(future.result())
+                except Exception:
+                    # e.g. a source that cannot be pickled or a crashed worker
+                    results.append(BatchResult(_source_name(source), filename, 0.0,
+                                               None, traceback.format_exc()))
+    for result in results:
+        if result.error is not None:
+            _log.warning('Exporting %s failed:\n%s', result.source, result.error)
+    return results
@@ -0,0 +1,213 @@
+"""
+Benchmarks of the DXF export.
+
+Every scenario builds a figure of a given data size and exports it to
+memory. For each scenario and size the wall time, the peak memory traced by
+``tracemalloc``, the output size and the number of entities by type are
+recorded:
+
+  python -m mpldxf.benchmark -o results.json
+  python -m mpldxf.benchmark --quick --compare results.json
+
+The results are JSON, so runs of different versions can be compared with
+``--compare``, which prints the ratios of time, memory and output size.
+"""
+
+import argparse
+import collections
+import gc
+import io
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import ezdxf
+import matplotlib
+import numpy as np
+from matplotlib.figure import Figure
+
+import mpldxf
+from mpldxf.backend_dxf import FigureCanvasDXF
+
+
+def lines(n):
+    """Five line plots of ``n`` points each."""
+    fig = Figure()
+    ax = fig.subplots()
+    x = np.linspace(0, 10, n)
+    for i in range(5):
+        ax.plot(x, np.sin(x + i) + np.random.default_rng(i).normal(0, 0.1, n))
+    return fig
+
+
+def contourf(n):
+    """Filled contours of an ``n`` x ``n`` grid."""
+    fig = Figure()
+    ax = fig.subplots()
+    x, y = np.meshgrid(np.linspace(-3, 3, n), np.linspace(-3, 3, n))
+    ax.contourf(x, y, np.sin(x * y) * np.exp(-(x ** 2 + y ** 2) / 4), levels=10)
+    return fig
+
+
+def hatched_bar(n):
+    """``n`` hatched bars."""
+    fig = Figure()
+    ax = fig.subplots()
+    hatches = ['/', '\\', 'x', 'o', '.', '*']
+    bars = ax.bar(range(n), np.random.default_rng(0).random(n))
+    for i, bar in enumerate(bars):
+        bar.set_hatch(hatches[i % len(hatches)])
+    return fig
+
+
+def scatter(n):
+    """A colormapped scatter plot of ``n`` points."""
+    fig = Figure()
+    ax = fig.subplots()
+    rng = np.random.default_rng(0)
+    ax.scatter(rng.random(n), rng.random(n), c=rng.random(n))
+    return fig
+
+
+def log_axes(n):
+    """A log-log plot of ``n`` points over many decades."""
+    fig = Figure()
+    ax = fig.subplots()
+    x = np.logspace(0, 12, n)
+    ax.plot(x, x ** 0.5)
+    ax.set(xscale='log', yscale='log')
+    return fig
+
+
+def text(n):
+    """A table of ``n`` cells."""
+    fig = Figure(figsize=(12, 12))
+    ax = fig.subplots()
+    ax.axis('off')
+    cols = 10
+    cells = [['%d.%d' % (row, col) for col in range(cols)] for row in range(max(1, n // cols))]
+    ax.table(cellText=cells, loc='center')
+    return fig
+
+
+#: The scenarios with their default data sizes.
+SCENARIOS = {
+    'lines': (lines, [1000, 10000, 100000]),
+    'contourf': (contourf, [20, 100, 300]),
+    'hatched_bar': (hatched_bar, [5, 20, 50]),
+    'scatter': (scatter, [100, 1000, 10000]),
+    'log_axes': (log_axes, [100, 10000, 100000]),
+    'text': (text, [50, 200, 1000]),
+}
+
+
+def _export(fig):
+    canvas = FigureCanvasDXF(fig)
+    buf = io.StringIO()
+    canvas.print_dxf(buf)
+    return canvas.dxf_renderer.drawing, len(buf.getvalue().encode('utf-8'))
+
+
+def run_scenario(name, size, repeat=3):
+    """Return the measurements of scenario ``name`` at ``size``, the time
+       is the best of ``repeat`` exports.
+    """
+    make_figure = SCENARIOS[name][0]
+    fig = make_figure(size)
+    seconds = []
+    for i in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        drawing, output_bytes = _export(fig)
+        seconds.append(time.perf_counter() - start)
+    # tracing slows the export down, so memory is measured separately
+    gc.collect()
+    tracemalloc.start()
+    try:
+        _export(fig)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    entities = collections.Counter(e.dxftype() for e in drawing.modelspace())
+    return dict(scenario=name, size=size, seconds=min(seconds), peak_memory=peak_memory,
+                output_bytes=output_bytes, entities=dict(sorted(entities.items())))
+
+
+def environment():
+    """Return the versions and platform the benchmarks ran with."""
+    return dict(
+        mpldxf=mpldxf.__version__, matplotlib=matplotlib.__version__,
+        ezdxf=ezdxf.__version__, numpy=np.__version__,
+        python=platform.python_version(), platform=platform.platform(),
+    )
+
+
+def run_benchmarks(scenarios=None, sizes=None, repeat=3, report=None):
+    """Run ``scenarios`` (default: all) at their default sizes or ``sizes``
+       and return the results with information on the environment.
+       ``report`` is called with every result as it is measured.
+    """
+    results = []
+    for name in scenarios or SCENARIOS:
+        for size in sizes or SCENARIOS[name][1]:
+            result = run_scenario(name, size, repeat)
+            if report is not None:
+                report(result)
+            results.append(result)
+    return dict(meta=environment(), results=results)
+
+
+def compare(old, new):
+    """Return report lines with the ratios new / old of the results of
+       the same scenario and size.
+    """
+    old_results = {(r['scenario'], r['size']): r for r in old['results']}
+    report = ['%-12s %8s %8s %8s %8s' % ('scenario', 'size', 'time', 'memory', 'bytes')]
+    for result in new['results']:
+        previous = old_results.get((result['scenario'], result['size']))
+        if previous is None:
+            continue
+        ratios = [result[k] / previous[k] if previous[k] else float('nan')
+                  for k in ('seconds', 'peak_memory', 'output_bytes')]
+        report.append('%-12s %8d %8.2f %8.2f %8.2f' % ((result['scenario'], result['size']) + tuple(ratios)))
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m mpldxf.benchmark',
+                                     description='Benchmark the DXF export.')
+    parser.add_argument('scenarios', nargs='*',
+                        help='scenarios to run (default: all): %s' % ', '.join(SCENARIOS))
+    parser.add_argument('-o', '--output', help='write the results to this JSON file')
+    parser.add_argument('--repeat', type=int, default=3, help='exports per measurement')
+    parser.add_argument('--quick', action='store_true', help='only run the smallest sizes')
+    parser.add_argument('--compare', metavar='JSON', help='compare to the results of an earlier run')
+    args = parser.parse_args(argv)
+
+    for name in args.scenarios:
+        if name not in SCENARIOS:
+            parser.error('unknown scenario %s' % name)
+
+    def print_result(result):
+        print('%-12s %8d %8.3f s %8.1f MB %10d bytes %8d entities' % (
+            result['scenario'], result['size'], result['seconds'],
+            result['peak_memory'] / 1e6, result['output_bytes'],
+            sum(result['entities'].values())))
+
+    report = dict(meta=environment(), results=[])
+    for name in args.scenarios or SCENARIOS:
+        sizes = SCENARIOS[name][1][:1] if args.quick else None
+        report['results'] += run_benchmarks([name], sizes, args.repeat, print_result)['results']
+    if args.output:
+        with open(args.output, 'w') as fh:
+            json.dump(report, fh, indent=1)
+    if args.compare:
+        with open(args.compare) as fh:
+            print('\n'.join(compare(json.load(fh), report)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
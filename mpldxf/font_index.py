@@ -0,0 +1,130 @@
+"""
+A persistent index of the TrueType fonts installed on the system.
+
+Reading the name table of every system font is slow when many fonts are
+installed, so the results are stored in matplotlib's cache directory and only
+fonts that were added or modified since the last run are read again.
+
+The index maps font file names to the extended font data used for DXF text
+styles:
+
+  from mpldxf.font_index import get_ttf_files
+  get_ttf_files()['DejaVuSans.ttf']
+  {'family': 'DejaVu Sans', 'bold': False, 'italic': False}
+
+Use ``rebuild_font_index`` to force a full rescan, e.g. after fonts have been
+removed.
+"""
+
+import json
+import logging
+import os
+
+from fontTools.ttLib import TTFont
+from matplotlib import font_manager, get_cachedir
+
+_log = logging.getLogger(__name__)
+
+#: Bump when the layout of the stored entries changes.
+FONT_INDEX_VERSION = 1
+
+# the index of the current process, loaded on first use
+_ttf_files = None
+
+
+def get_font_index_path():
+    """Return the path of the on-disk font index."""
+    return os.path.join(get_cachedir(),
+                        'mpldxf-fontindex-v%d.json' % FONT_INDEX_VERSION)
+
+
+def _read_font_data(ttf_path):
+    """Read the extended font data of a single TTF file."""
+    with TTFont(ttf_path, lazy=True) as ttfont:
+        names = ttfont['name'].names
+        family = str(names[1])
+        style = str(names[2])
+    return dict(family=family, bold='Bold' in style, italic='Italic' in style)
+
+
+def _load_index(index_path):
+    try:
+        with open(index_path, encoding='utf-8') as fh:
+            index = json.load(fh)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(index, dict):
+        return {}
+    return index
+
+
+def _save_index(index, index_path):
+    tmp_path = '%s.%d.tmp' % (index_path, os.getpid())
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as fh:
+            json.dump(index, fh)
+        os.replace(tmp_path, index_path)
+    except OSError as e:
+        _log.warning('Could not write font index %s: %s', index_path, e)
+
+
+def _scan(index, index_path):
+    """Bring ``index`` up to date with the installed fonts.
+
+       Entries are keyed by font path and reused while the file mtime is
+       unchanged. The index is written back only if it changed.
+    """
+    updated = {}
+    changed = False
+    for ttf_path in font_manager.findSystemFonts(fontpaths=None, fontext='ttf'):
+        ttf_file = os.path.basename(ttf_path)
+        if not ('.ttf' in ttf_file or '.TTF' in ttf_file):
+            continue
+        try:
+            mtime = os.stat(ttf_path).st_mtime
+        except OSError:
+            continue
+        entry = index.get(ttf_path)
+        if entry is None or entry.get('mtime') != mtime:
+            try:
+                data = _read_font_data(ttf_path)
+            except Exception as e:
+                _log.debug('Skipping unreadable font %s: %s', ttf_path, e)
+                data = None
+            entry = dict(mtime=mtime, data=data)
+            changed = True
+        updated[ttf_path] = entry
+    if changed or len(updated) != len(index):
+        _save_index(updated, index_path)
+    return updated
+
+
+def _to_ttf_files(index):
+    ttf_files = {}
+    for ttf_path in sorted(index):
+        data = index[ttf_path]['data']
+        if data is not None:
+            ttf_files[os.path.basename(ttf_path)] = data
+    return ttf_files
+
+
+def get_ttf_files():
+    """Return a dict mapping TTF file names to their extended font data.
+
+       The font index is loaded (and refreshed) on the first call only.
+    """
+    global _ttf_files
+    if _ttf_files is None:
+        index_path = get_font_index_path()
+        _ttf_files = _to_ttf_files(_scan(_load_index(index_path), index_path))
+    return _ttf_files
+
+
+def rebuild_font_index():
+    """Rescan all system fonts, rewrite the on-disk index and return the
+       refreshed mapping of ``get_ttf_files``.
+    """
+    global _ttf_files
+    index_path = get_font_index_path()
+    _ttf_files = _to_ttf_files(_scan({}, index_path))
+    return _ttf_files
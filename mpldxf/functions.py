@@ -1,52 +1,535 @@
+import collections
+import math
+from fractions import Fraction
+
 import numpy as np
+import shapely
+from shapely.errors import GEOSException
 from shapely.geometry import LineString, Polygon, MultiLineString
 from shapely.ops import linemerge
 
+CacheInfo = collections.namedtuple('CacheInfo', 'hits misses maxsize currsize')
+
+
+class LRUCache:
+    """A mapping of at most ``maxsize`` items that drops the least recently
+       used item when it is full.
+
+       Lookups with ``get`` are counted, ``info`` returns the statistics
+       like ``functools.lru_cache``.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = collections.OrderedDict()
+
+    def get(self, key, default=None):
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def __setitem__(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def clear(self):
+        """Remove all items and reset the statistics."""
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self):
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+
+def clip_rectangle(vertices, bounds):
+    """Clip the polyline ``vertices`` to the axis aligned box ``bounds``
+       given as ``(x0, y0, x1, y1)``.
+
+       All segments are clipped at once with the Liang-Barsky algorithm.
+       Returns a list of vertex arrays, one for every continuous run of the
+       polyline inside the box.
+    """
+    vertices = np.asarray(vertices, dtype=float)
+    if len(vertices) > 1:
+        # zero length segments only complicate finding the runs
+        vertices = vertices[np.r_[True, np.any(vertices[1:] != vertices[:-1], axis=1)]]
+    if len(vertices) < 2:
+        return []
+    x0, y0, x1, y1 = bounds
+    x0, x1 = min(x0, x1), max(x0, x1)
+    y0, y1 = min(y0, y1), max(y0, y1)
+
+    left, right = vertices[:, 0] < x0, vertices[:, 0] > x1
+    below, above = vertices[:, 1] < y0, vertices[:, 1] > y1
+    inside = ~(left | right | below | above)
+    if inside.all():
+        return [vertices]
+
+    start = vertices[:-1]
+    delta = vertices[1:] - start
+    t0 = np.zeros(len(start))
+    t1 = np.ones(len(start))
+    keep = inside[:-1] & inside[1:]
+    # segments with both vertices beyond the same edge are outside, only the
+    # remaining ones need to be clipped, the part of a segment inside the
+    # box satisfies p * t <= q for every edge
+    outside = ((left[:-1] & left[1:]) | (right[:-1] & right[1:]) |
+               (below[:-1] & below[1:]) | (above[:-1] & above[1:]))
+    crossing = np.flatnonzero(~(keep | outside))
+    start_c, delta_c = start[crossing], delta[crossing]
+    p = np.stack([-delta_c[:, 0], delta_c[:, 0], -delta_c[:, 1], delta_c[:, 1]], axis=1)
+    q = np.stack([start_c[:, 0] - x0, x1 - start_c[:, 0],
+                  start_c[:, 1] - y0, y1 - start_c[:, 1]], axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r = q / p
+    t0[crossing] = np.maximum(np.where(p < 0, r, -np.inf).max(axis=1), 0)
+    t1[crossing] = np.minimum(np.where(p > 0, r, np.inf).min(axis=1), 1)
+    keep[crossing] = (t0[crossing] < t1[crossing]) & ~np.any((p == 0) & (q < 0), axis=1)
+    index = np.flatnonzero(keep)
+    if not len(index):
+        return []
+
+    # a kept segment continues the run of the previous one if both are
+    # unclipped at their shared vertex
+    t0, t1 = t0[index], t1[index]
+    new_run = np.ones(len(index), dtype=bool)
+    new_run[1:] = (index[1:] != index[:-1] + 1) | (t1[:-1] < 1) | (t0[1:] > 0)
+    first = start[index] + t0[:, np.newaxis] * delta[index]
+    last = start[index] + t1[:, np.newaxis] * delta[index]
+
+    return _join_runs(first, last, new_run)
+
 
-def clip_geometry(vertices, clippoly):
+def _intersection(geoms, clippoly):
+    # intersect all geometries at once, fall back to one at a time so that
+    # a single failing geometry only drops itself
+    try:
+        return shapely.intersection(geoms, clippoly)
+    except GEOSException:
+        result = np.empty_like(geoms)
+        for i, geom in enumerate(geoms):
+            try:
+                result[i] = geom.intersection(clippoly)
+            except GEOSException:
+                result[i] = None
+        return result
+
+
+def _join_runs(first, last, new_run):
+    """Join clipped segments into continuous runs.
+
+       ``first`` and ``last`` are the clipped start and end points of the
+       segments in order and ``new_run`` flags the segments that do not
+       continue the previous one. Returns a list of vertex arrays.
+    """
+    # each run is its first start point followed by the end points
+    points = np.empty((len(first) + new_run.sum(), 2))
+    position = np.arange(len(first)) + np.cumsum(new_run)
+    points[position] = last
+    points[position[new_run] - 1] = first[new_run]
+    return np.split(points, (position[new_run] - 1)[1:])
+
+
+def clip_segments(vertices, clippoly):
+    """Clip every segment of the polyline ``vertices`` to the shapely
+       geometry ``clippoly`` in a single batch.
+
+       Unlike clipping the polyline as a whole this works for self
+       intersecting polylines. Returns a list of vertex arrays, one for every
+       continuous run inside ``clippoly``.
+    """
+    vertices = np.asarray(vertices, dtype=float)
+    if len(vertices) < 2:
+        return []
+    segments = np.stack([vertices[:-1], vertices[1:]], axis=1)
+    clipped = _intersection(shapely.linestrings(segments), clippoly)
+    parts, index = shapely.get_parts(clipped, return_index=True)
+    keep = (shapely.get_type_id(parts) == 1) & (shapely.length(parts) > 0)
+    parts, index = parts[keep], index[keep]
+    if not len(parts):
+        return []
+
+    first = shapely.get_coordinates(shapely.get_point(parts, 0))
+    last = shapely.get_coordinates(shapely.get_point(parts, -1))
+    # orient the parts along their segment and sort them by position on it
+    origin = segments[index, 0]
+    direction = segments[index, 1] - origin
+    t_first = np.einsum('ij,ij->i', first - origin, direction)
+    t_last = np.einsum('ij,ij->i', last - origin, direction)
+    flip = t_last < t_first
+    first[flip], last[flip] = last[flip], first[flip]
+    order = np.lexsort((np.minimum(t_first, t_last), index))
+    first, last = first[order], last[order]
+
+    # unclipped vertices are returned unchanged, so a part continues the
+    # previous run if it starts exactly where the run ends
+    new_run = np.ones(len(first), dtype=bool)
+    new_run[1:] = np.any(first[1:] != last[:-1], axis=1)
+    return _join_runs(first, last, new_run)
+
+
+def _clip_shapely(vertices, clippoly):
     # clip the polygon if clip rectangle present
-    if not isinstance(vertices, LineString) and len(vertices) < 2:  # ignore single points
-        return None
+    if len(vertices) < 2:  # ignore single points
+        return []
 
     shape = LineString(vertices)
 
     if not clippoly.contains(shape) and not clippoly.intersects(shape):
-        return None
+        return []
 
     if not shape.is_simple:
         # when shape crosses itself shapely contains, etc. does not work
-        # correctly, so we split the shape, clip individual segments and
-        # join them back as a single array
-        vertices_all = []
-        for pt1, pt2 in zip(shape.coords, shape.coords[1:]):
-            vertices_ = np.array([pt1, pt2])
-            vertices_ = clip_geometry(vertices_, clippoly)
-            if vertices_ is not None:
-                vertices_all.append(vertices_)
-        vertices_all = np.concatenate(vertices_all, axis=0)
-        return vertices_all
+        # correctly, so all the segments are clipped individually
+        return clip_segments(vertices, clippoly)
     shape = shape.intersection(clippoly)
     if shape.geom_type == 'MultiLineString':
         shape = linemerge(shape)
     if shape.geom_type == 'MultiLineString':
-        vertices_all = []
-        for shape_ in shape.geoms:
-            vertices_ = clip_geometry(shape_, clippoly)
-            if vertices_ is not None:
-                vertices_all.append(vertices_)
-        vertices_all = np.concatenate(vertices_all, axis=0)
-        return vertices_all
+        return [np.asarray(shape_.coords) for shape_ in shape.geoms]
     if shape.geom_type == 'MultiPoint':
         # very rare cases like 's650'
-        shape = LineString([x for x in shape.geoms])
-        return clip_geometry(shape, clippoly)
-    if shape.geom_type != 'LineString':
+        return _clip_shapely(shapely.get_coordinates(shape), clippoly)
+    if shape.geom_type != 'LineString' or shape.is_empty:
         # very rare cases like 's650'
+        return []
+    return [np.asarray(shape.coords)]
+
+
+def clip_geometry(vertices, clippoly, join=True):
+    """Clip the polyline ``vertices`` to ``clippoly``.
+
+       ``clippoly`` is a shapely geometry or, for an axis aligned clip box,
+       a ``(x0, y0, x1, y1)`` tuple which is clipped without shapely.
+
+       By default the pieces left after clipping are joined into a single
+       vertex array, which is what closed outlines of filled areas need, and
+       None is returned if nothing is left. With ``join=False`` the list of
+       separate pieces is returned instead.
+    """
+    if isinstance(vertices, LineString):
+        vertices = np.asarray(vertices.coords)
+    if isinstance(clippoly, tuple):
+        runs = clip_rectangle(vertices, clippoly)
+    else:
+        runs = _clip_shapely(vertices, clippoly)
+    if not join:
+        return runs
+    if not runs:
         return None
-    vertices = np.array(list(zip(*shape.coords.xy)))
-    if vertices.size == 0:
-        return None
-    return vertices
+    return np.concatenate(runs, axis=0)
+
+
+def clip_polygons(polygons, bounds):
+    """Clip the (n, m, 2) array of simple ``polygons`` to the axis aligned
+       box ``bounds`` given as ``(x0, y0, x1, y1)``.
+
+       Unlike ``clip_geometry`` the polygons are clipped as areas, so the
+       corners of the box are kept. Returns a list with the exterior vertex
+       arrays left of every polygon.
+    """
+    x0, y0, x1, y1 = bounds
+    clipbox = shapely.box(min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1))
+    result = []
+    for geom in _intersection(shapely.polygons(polygons), clipbox):
+        parts = []
+        if geom is not None:
+            for part in shapely.get_parts(geom):
+                if isinstance(part, Polygon) and not part.is_empty:
+                    parts.append(np.asarray(part.exterior.coords))
+        result.append(parts)
+    return result
+
+
+def simplify_polyline(vertices, tolerance, closed=False):
+    """Simplify the polyline ``vertices`` with the Douglas-Peucker algorithm,
+       removing vertices that are less than ``tolerance`` from the
+       simplified line.
+
+       The end points of open polylines are kept. ``closed`` polylines are
+       simplified as rings (with or without a repeated first vertex) and
+       keep at least three vertices.
+    """
+    vertices = np.asarray(vertices, dtype=float)
+    if len(vertices) < 3 or not tolerance > 0:
+        return vertices
+    if not closed:
+        return shapely.get_coordinates(
+            shapely.simplify(shapely.linestrings(vertices), tolerance, preserve_topology=False))
+    repeated = np.array_equal(vertices[0], vertices[-1])
+    ring = vertices if repeated else np.vstack([vertices, vertices[:1]])
+    if len(ring) < 5:
+        return vertices
+    try:
+        simplified = shapely.get_coordinates(
+            shapely.simplify(shapely.linearrings(ring), tolerance, preserve_topology=True))
+    except GEOSException:
+        return vertices
+    if len(simplified) < 4:
+        return vertices
+    return simplified if repeated else simplified[:-1]
+
+
+def decimate_minmax(vertices, bin_width):
+    """Decimate the polyline ``vertices`` with monotonic x values, e.g. a
+       time series, to the first, last, lowest and highest vertex of every
+       ``bin_width`` wide column, in their original order.
+
+       The envelope of the line is kept, so it looks the same at a
+       resolution of ``bin_width``.
+    """
+    vertices = np.asarray(vertices, dtype=float)
+    n = len(vertices)
+    if n < 5:
+        return vertices
+    x, y = vertices[:, 0], vertices[:, 1]
+    bins = np.floor(np.abs(x - x[0]) / bin_width).astype(np.int64)
+    starts = np.flatnonzero(np.r_[True, bins[1:] != bins[:-1]])
+    ends = np.r_[starts[1:], n] - 1
+    segment = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, n]))
+    keep = np.zeros(n, dtype=bool)
+    keep[starts] = True
+    keep[ends] = True
+    for extreme in (np.minimum.reduceat(y, starts), np.maximum.reduceat(y, starts)):
+        # the first vertex of every column with its extreme
+        candidates = np.flatnonzero(y == extreme[segment])
+        first = np.r_[True, segment[candidates[1:]] != segment[candidates[:-1]]]
+        keep[candidates[first]] = True
+    return vertices[keep]
+
+
+def chunk_polyline(vertices, max_vertices):
+    """Split the polyline ``vertices`` into polylines of at most
+       ``max_vertices`` vertices, consecutive chunks share their end vertex.
+    """
+    if len(vertices) <= max_vertices:
+        return [vertices]
+    step = max(1, max_vertices - 1)
+    return [vertices[i:i + step + 1] for i in range(0, len(vertices) - 1, step)]
+
+
+def _enclosing_rings(rings):
+    """Return the polygons of the closed ``rings`` and the index pairs
+       ``(inner, outer)`` of the rings enclosed by another ring.
+    """
+    polygons = np.array([Polygon(ring) if len(ring) >= 3 else Polygon() for ring in rings])
+    if len(rings) < 2:
+        return polygons, np.empty((2, 0), dtype=np.intp)
+    # a ring is enclosed by the rings that contain its first vertex, it
+    # lies on its own boundary and not within itself
+    starts = shapely.points([ring[0] if len(ring) else (np.nan, np.nan) for ring in rings])
+    return polygons, shapely.STRtree(polygons).query(starts, predicate='within')
+
+
+def nesting_depths(rings):
+    """Return the number of other rings enclosing each of the closed
+       ``rings``. Rings of even depth are outer boundaries, rings of odd
+       depth are holes.
+    """
+    inner = _enclosing_rings(rings)[1][0]
+    return np.bincount(inner, minlength=len(rings))
+
+
+def even_odd_polygon(rings):
+    """Return the area inside an odd number of the closed ``rings``, i.e.
+       the area filled by a compound path, as a shapely (Multi)Polygon.
+    """
+    polygons, (inner, outer) = _enclosing_rings(rings)
+    if len(rings) == 1:
+        return polygons[0]
+    depths = np.bincount(inner, minlength=len(rings))
+    holes = {i: [] for i in np.flatnonzero(depths % 2 == 0)}
+    # the shell of a hole is the enclosing ring one level up
+    parent = depths[outer] == depths[inner] - 1
+    for i, j in zip(inner[parent], outer[parent]):
+        if depths[i] % 2 and not polygons[i].is_empty:
+            holes[j].append(rings[i])
+    shells = [Polygon(rings[i], holes[i]) for i in sorted(holes) if not polygons[i].is_empty]
+    return shapely.MultiPolygon(shells) if len(shells) != 1 else shells[0]
+
+
+def tile_hatch(polygons, rows, cols, step, clippoly):
+    """Tile hatch polygons over a grid and clip them to ``clippoly``.
+
+       ``polygons`` is the list of vertex arrays of a single hatch tile. The
+       tile is repeated at ``step`` intervals for rows ``-rows..rows`` and
+       columns ``-cols..cols``. Closed vertex arrays become polygons, open
+       ones line strings. Invalid and non-intersecting shapes are dropped and
+       self-intersecting ones are kept unclipped.
+
+       Returns a list of shapely Polygons and LineStrings, ordered by tile
+       (row-major) and then by hatch polygon.
+    """
+    irow, icol = np.meshgrid(np.arange(-rows, rows + 1),
+                             np.arange(-cols, cols + 1), indexing='ij')
+    offsets = np.column_stack([icol.ravel(), irow.ravel()]) * step
+    tiles, parts, shapes = [], [], []
+    for ipoly, vertices in enumerate(polygons):
+        if len(vertices) < 2:
+            continue
+        # one array with the vertices of this polygon in every tile
+        coords = vertices[np.newaxis] + offsets[:, np.newaxis]
+        if np.array_equal(vertices[0], vertices[-1]):
+            geoms = shapely.polygons(coords)
+        else:
+            geoms = shapely.linestrings(coords)
+        itile = np.flatnonzero(shapely.is_valid(geoms) & shapely.intersects(clippoly, geoms))
+        geoms = geoms[itile]
+        simple = shapely.is_simple(geoms)
+        geoms[simple] = _intersection(geoms[simple], clippoly)
+        tiles.append(itile)
+        parts.append(np.full(len(itile), ipoly))
+        shapes.append(geoms)
+    if not shapes:
+        return []
+    tiles, parts, shapes = np.concatenate(tiles), np.concatenate(parts), np.concatenate(shapes)
+    shapes = shapes[np.lexsort((parts, tiles))]
+
+    result = []
+    for shape in shapes:
+        if shape is None:
+            continue
+        if shape.geom_type in ['Polygon', 'LineString']:
+            result.append(shape)
+        elif shape.geom_type in ['MultiPolygon', 'MultiLineString']:
+            result.extend(shape.geoms)
+    return result
+
+
+def _egcd(a, b):
+    """Return ``g, x, y`` with ``a * x + b * y == g == gcd(a, b)``."""
+    x0, y0, x1, y1 = 1, 0, 0, 1
+    while b:
+        q, a, b = a // b, b, a % b
+        x0, x1 = x1, x0 - q * x1
+        y0, y1 = y1, y0 - q * y1
+    if a < 0:
+        a, x0, y0 = -a, -x0, -y0
+    return a, x0, y0
+
+
+def _lattice_basis(vectors):
+    """Return a basis ``(a, b), (0, c)`` of the integer lattice spanned by
+       ``vectors``.
+    """
+    a = b = c = 0
+    for x, y in vectors:
+        if x == 0 and a == 0:
+            c = math.gcd(c, y)
+            continue
+        g, s, t = _egcd(a, x)
+        # the unimodular combination of (a, b) and (x, y) gives one vector
+        # with x == g and one with x == 0
+        a, b, c = g, s * b + t * y, math.gcd(c, (x // g) * b - (a // g) * y)
+    if c:
+        b %= c
+    return (a, b), (0, c)
+
+
+def _translation_lattice(starts, ndigits):
+    """Return the lattice of translations that map the set of points
+       ``starts`` onto itself modulo the unit grid.
+
+       The lattice is returned as the matrix ``M`` of an integer basis
+       ``(a, b), (0, c)`` scaled back to tile units, so that lattice points
+       are ``M @ (i, j)`` for integers ``i``, ``j``.
+    """
+    keys = {tuple(np.round(start % 1, ndigits) % 1) for start in starts}
+    symmetry = []
+    for start in starts[1:]:
+        t = (start - starts[0]) % 1
+        t_frac = tuple(Fraction(float(ti)).limit_denominator(1000) for ti in t)
+        if np.abs(np.array(t_frac, dtype=float) - t).max() > 10 ** -ndigits:
+            continue
+        if all(tuple(np.round((p + t) % 1, ndigits) % 1) in keys for p in starts):
+            symmetry.append(t_frac)
+    denom = math.lcm(1, *(t.denominator for ts in symmetry for t in ts))
+    (a, b), (_, c) = _lattice_basis([(denom, 0), (0, denom)] +
+                                    [(int(tx * denom), int(ty * denom)) for tx, ty in symmetry])
+    return np.array([[a, 0], [b, c]], dtype=float) / denom
+
+
+def _snap_direction(direction, max_period):
+    """Return coprime integers ``(m, n)`` approximating ``direction``."""
+    dx, dy = direction
+    if abs(dx) >= abs(dy):
+        ratio = Fraction(float(dy / dx)).limit_denominator(max_period)
+        m, n = ratio.denominator, ratio.numerator
+        sign = 1 if dx > 0 else -1
+    else:
+        ratio = Fraction(float(dx / dy)).limit_denominator(max_period)
+        m, n = ratio.numerator, ratio.denominator
+        sign = 1 if dy > 0 else -1
+    return sign * m, sign * n
+
+
+def hatch_pattern_definition(polygons, max_period=32, ndigits=6):
+    """Convert the vertex arrays of a unit hatch tile to a DXF hatch pattern.
+
+       Every segment of the tile becomes a pattern line (a family of parallel
+       dashed lines) that repeats the segment on a translation lattice: the
+       unit grid plus any smaller translations that map all segments with the
+       same vector onto each other. Segments that are lattice translations of
+       each other share a pattern line. Segment directions are snapped to
+       lattice directions no more than ``max_period`` lattice steps long.
+
+       Returns a list of ``[angle, base_point, offset, dash_length_items]``
+       in tile units, as used by ``ezdxf`` ``Hatch.set_pattern_fill``.
+    """
+    classes = {}
+    for vertices in polygons:
+        vertices = np.asarray(vertices, dtype=float)
+        for p0, p1 in zip(vertices[:-1], vertices[1:]):
+            vector = p1 - p0
+            if np.hypot(*vector) > 10 ** -ndigits:
+                classes.setdefault(tuple(np.round(vector, ndigits)), []).append(p0)
+
+    definition = []
+    for vector, starts in classes.items():
+        vector = np.array(vector)
+        lattice = _translation_lattice(starts, ndigits)
+        to_lattice = np.linalg.inv(lattice)
+
+        # snap the direction to a primitive lattice vector (m, n) and find a
+        # lattice vector (p, q) with m * q - n * p == 1 to step between lines
+        m, n = _snap_direction(to_lattice @ vector, max_period)
+        _, q, p = _egcd(m, -n)
+        period = lattice @ (m, n)
+        offset = lattice @ (p, q)
+        angle = math.degrees(math.atan2(period[1], period[0]))
+        period_length = np.hypot(*period)
+        length = np.hypot(*vector)
+        if length >= period_length - 10 ** -ndigits:
+            dashes = []
+        else:
+            dashes = [float(length), float(length - period_length)]
+
+        seen = set()
+        for start in starts:
+            # one pattern line per class of lattice translations
+            key = tuple(np.round(to_lattice @ start % 1, ndigits) % 1)
+            if key in seen:
+                continue
+            seen.add(key)
+            definition.append([angle, (float(start[0]), float(start[1])),
+                               (float(offset[0]), float(offset[1])), dashes])
+    return definition
 
 
 def fill_polygon_with_lines(polygon, delta=0.025):
@@ -19,19 +19,27 @@ COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
 IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
 CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
+import gzip
+import io
+import ezdxf
 import matplotlib
 import numpy as np
 import os
 import shutil
 import tempfile
 import unittest
-from matplotlib import pyplot as plt
+from unittest import mock
+from matplotlib import colors as mcolors, pyplot as plt
+from matplotlib.patches import PathPatch
+from matplotlib.path import Path
 from numpy.random import random
 
 from mpldxf import backend_dxf
 
 matplotlib.backend_bases.register_backend('dxf',
                                           backend_dxf.FigureCanvas)
+matplotlib.backend_bases.register_backend('dxfz',
+                                          backend_dxf.FigureCanvas)
 
 
 class DxfBackendTestCase(unittest.TestCase):
@@ -82,6 +90,28 @@ class DxfBackendTestCase(unittest.TestCase):
         plt.savefig(outfile)
         self.assertTrue(os.path.isfile(outfile))
 
+    def test_compound_path(self):
+        """Test that the rings of a compound path are one HATCH and GROUP."""
+        fig, ax = plt.subplots()
+        square = [(0, 0), (1, 0), (1, 1), (0, 1), (0, 0)]
+        rings = [Path(np.array(square) * size + offset, closed=True)
+                 for size, offset in [(10, 0), (6, 2), (2, 4)]]
+        ax.add_patch(PathPatch(Path.make_compound_path(*rings), facecolor='red', hatch='/'))
+        ax.set(xlim=(-1, 11), ylim=(-1, 11))
+        drawing = backend_dxf.FigureCanvasDXF(fig).draw()
+        red = backend_dxf.get_color_attribs((1, 0, 0))['true_color']
+        fill, = drawing.modelspace().query('HATCH[true_color==%d]' % red)
+        self.assertEqual([path.path_type_flags & 1 for path in fill.paths], [1, 0, 1])
+        self.assertEqual(sum(fill in group for name, group in drawing.groups), 1)
+        # no hatch lines between the hole and the island
+        (hx0, hy0), (hx1, hy1) = [(min(c), max(c)) for c in zip(*fill.paths[1].vertices)][:2]
+        (ix0, iy0), (ix1, iy1) = [(min(c), max(c)) for c in zip(*fill.paths[2].vertices)][:2]
+        for line in drawing.modelspace().query('LWPOLYLINE'):
+            for x, y in line.get_points('xy'):
+                in_hole = hx0 + 0.5 < x < hx1 - 0.5 and hy0 + 0.5 < y < hy1 - 0.5
+                in_island = ix0 - 0.5 < x < ix1 + 0.5 and iy0 - 0.5 < y < iy1 + 0.5
+                self.assertFalse(in_hole and not in_island)
+
     def test_bar(self):
         """Test a simple bar with hatches."""
         fig, ax = self.setFig()
@@ -98,3 +128,418 @@ class DxfBackendTestCase(unittest.TestCase):
         outfile = os.path.join(self.test_dir, 'test_bar.dxf')
         fig.savefig(outfile)
         self.assertTrue(os.path.isfile(outfile))
+
+    def test_text_styles(self):
+        """Test that only the text styles used by the figure are added."""
+        fig, ax = plt.subplots()
+        ax.set_title('title')
+        ax.text(0.5, 0.5, 'bold', fontweight='bold')
+        drawing = backend_dxf.FigureCanvasDXF(fig).draw()
+        used = {text.dxf.style for text in drawing.modelspace().query('TEXT')}
+        default = {style.dxf.name for style in ezdxf.new(setup=True).styles}
+        styles = {style.dxf.name for style in drawing.styles} - default
+        self.assertEqual(styles, used)
+
+    def test_drawing_template(self):
+        """Test that drawings cloned from the template are independent."""
+        drawing1 = backend_dxf.new_drawing('AC1032')
+        drawing2 = backend_dxf.new_drawing('AC1032')
+        self.assertFalse(drawing1.layers.get('HIDDEN').is_on())
+        drawing1.modelspace().add_line((0, 0), (1, 1))
+        self.assertEqual(len(drawing2.modelspace()), 0)
+        self.assertNotEqual(drawing1.header['$FINGERPRINTGUID'],
+                            drawing2.header['$FINGERPRINTGUID'])
+
+    def test_bar_hatch_pattern(self):
+        """Test hatches drawn as DXF pattern fills."""
+        fig, ax = plt.subplots()
+        hatches = ['/', 'o', '*-']
+        ax.bar(x=range(3), height=1, hatch=hatches, color=['none', 'red', 'none'])
+        with mock.patch.object(backend_dxf, 'HATCH_LINES_DRAW_AS_PAT', True):
+            drawing = backend_dxf.FigureCanvasDXF(fig).draw()
+        pattern_hatches = [hatch for hatch in drawing.modelspace().query('HATCH')
+                           if not hatch.has_solid_fill]
+        self.assertEqual(len(pattern_hatches), len(hatches))
+        for hatch in pattern_hatches:
+            self.assertTrue(hatch.dxf.associative)
+            self.assertTrue(hatch.pattern.lines)
+
+        # later exports follow a changed scale factor
+        with mock.patch.object(backend_dxf, 'HATCH_LINES_DRAW_AS_PAT', True), \
+                mock.patch.object(backend_dxf, 'HATCH_SCALE_FACTOR', 1):
+            drawing = backend_dxf.FigureCanvasDXF(fig).draw()
+        scaled = [hatch for hatch in drawing.modelspace().query('HATCH')
+                  if not hatch.has_solid_fill]
+        self.assertAlmostEqual(scaled[0].pattern.lines[0].offset.magnitude,
+                               2 * pattern_hatches[0].pattern.lines[0].offset.magnitude)
+
+        # no empty hatch is left of an outline that is clipped away
+        fig, ax = plt.subplots()
+        ax.add_patch(matplotlib.patches.Rectangle((-1, -1), 3, 3, hatch='/', facecolor='none'))
+        ax.set(xlim=(0, 1), ylim=(0, 1))
+        with mock.patch.object(backend_dxf, 'HATCH_LINES_DRAW_AS_PAT', True):
+            drawing = backend_dxf.FigureCanvasDXF(fig).draw()
+        for hatch in drawing.modelspace().query('HATCH'):
+            self.assertTrue(hatch.paths)
+
+    def test_clipped_line(self):
+        """Test that a line leaving the axes is split, not joined along the edge."""
+        fig, ax = plt.subplots()
+        ax.plot([0, 1, 2, 3, 4], [0, 2, 0, 2, 0], color='red')
+        ax.set_ylim(-1, 1)
+        drawing = backend_dxf.FigureCanvasDXF(fig).draw()
+        red = ezdxf.rgb2int((255, 0, 0))
+        lines = [poly for poly in drawing.modelspace().query('LWPOLYLINE')
+                 if poly.dxf.get('true_color') == red]
+        self.assertEqual([len(poly) for poly in lines], [2, 3, 2])
+
+    def test_clip_stats(self):
+        """Test that paths are only clipped when they cross the clip box."""
+        fig, ax = plt.subplots()
+        ax.plot([1, 2], [1, 2])
+        ax.plot([0, 10], [1, 2])
+        ax.plot([8, 9], [1, 2])
+        ax.set_xlim(0.5, 5)
+        canvas = backend_dxf.FigureCanvasDXF(fig)
+        canvas.draw()
+        stats = canvas.dxf_renderer.clip_stats
+        self.assertEqual(stats['inside'], 1)
+        self.assertEqual(stats['clipped'], 1)
+        self.assertEqual(stats['outside'], 1)
+
+        # closed paths, e.g. bars, strictly inside are not clipped either
+        fig, ax = plt.subplots()
+        ax.bar(range(5), [1, 2, 3, 2, 1], bottom=0.5)
+        ax.set_ylim(0, 5)
+        canvas = backend_dxf.FigureCanvasDXF(fig)
+        canvas.draw()
+        stats = canvas.dxf_renderer.clip_stats
+        self.assertEqual(stats['inside'], 5)
+        self.assertEqual(stats['clipped'], 0)
+
+    def test_markers(self):
+        """Test that markers are drawn as INSERTs of a single block."""
+        fig, ax = plt.subplots()
+        ax.plot(np.arange(100), np.arange(100), 'o', mfc='r')
+        ax.set_xlim(-0.5, 49.5)
+        ax.tick_params(length=0)
+        drawing = backend_dxf.FigureCanvasDXF(fig).draw()
+        inserts = drawing.modelspace().query('INSERT')
+        self.assertEqual(len(inserts), 50)
+        self.assertEqual(len(set(insert.dxf.name for insert in inserts)), 1)
+        block = drawing.blocks.get(inserts[0].dxf.name)
+        self.assertEqual(len(block.query('HATCH')), 1)
+
+    def test_markers_clipped(self):
+        """Test that markers crossing the clip box are clipped, not culled."""
+        color = backend_dxf.get_color_attribs(mcolors.to_rgb('C0'))['true_color']
+        for scatter in (False, True):
+            fig, ax = plt.subplots()
+            if scatter:
+                ax.scatter([0.5, 1.0, 1.02], [0.5, 0.5, 0.5], s=1600, marker='s')
+            else:
+                ax.plot([0.5, 1.0, 1.02], [0.5, 0.5, 0.5], 's', ms=40)
+            ax.set(xlim=(0, 1), ylim=(0, 1))
+            ax.axis('off')
+            drawing = backend_dxf.FigureCanvasDXF(fig).draw()
+            self.assertEqual(len(drawing.modelspace().query('INSERT')), 1)
+            outlines = drawing.modelspace().query('LWPOLYLINE[true_color==%d]' % color)
+            self.assertEqual(len(outlines), 2)
+            for outline in outlines:
+                for x, y in outline.get_points('xy'):
+                    self.assertLessEqual(x, ax.bbox.x1 + 1e-6)
+
+    def test_path_collection(self):
+        """Test that collection styles are resolved once per distinct style
+           and repeated paths are inserted as blocks."""
+        fig, ax = plt.subplots()
+        ax.scatter(np.arange(60), np.arange(60), c=np.arange(60) % 3)
+        ax.add_collection(matplotlib.collections.LineCollection(
+            random((30, 2, 2)), colors=['r', 'g', 'b']))
+        ax.tick_params(length=0)
+        canvas = backend_dxf.FigureCanvasDXF(fig)
+        renderer = canvas.get_dxf_renderer()
+        with mock.patch.object(renderer, 'check_gc', wraps=renderer.check_gc) as check_gc:
+            drawing = canvas.draw()
+        self.assertLess(check_gc.call_count, 60)
+        # one filled marker block per color
+        names = [insert.dxf.name for insert in drawing.modelspace().query('INSERT')
+                 if drawing.blocks.get(insert.dxf.name).query('HATCH')]
+        self.assertEqual(len(names), 60)
+        self.assertEqual(len(set(names)), 3)
+
+    def test_quad_mesh(self):
+        """Test that mesh cells are drawn as SOLIDs, crossing ones clipped."""
+        fig, ax = plt.subplots()
+        ax.pcolormesh(random((10, 20)))
+        ax.set_xlim(0.5, 20)
+        drawing = backend_dxf.FigureCanvasDXF(fig).draw()
+        modelspace = drawing.modelspace()
+        self.assertEqual(len(modelspace.query('SOLID')), 190)
+        # the clipped cells and the figure and axes backgrounds
+        self.assertEqual(len(modelspace.query('HATCH')), 12)
+
+    def test_gouraud_triangles(self):
+        """Test that gouraud shaded triangles are drawn as SOLIDs."""
+        fig, ax = plt.subplots()
+        x, y = np.meshgrid(np.arange(5), np.arange(5))
+        ax.tripcolor(x.ravel(), y.ravel(), (x * y).ravel(), shading='gouraud')
+        drawing = backend_dxf.FigureCanvasDXF(fig).draw()
+        self.assertEqual(len(drawing.modelspace().query('SOLID')), 32)
+
+    def test_image(self):
+        """Test that identical images share one PNG file next to the DXF."""
+        fig, (ax1, ax2) = plt.subplots(1, 2)
+        data = random((10, 10))
+        ax1.imshow(data)
+        ax2.imshow(data)
+        outfile = os.path.join(self.test_dir, 'test_image.dxf')
+        fig.savefig(outfile)
+        drawing = ezdxf.readfile(outfile)
+        images = drawing.modelspace().query('IMAGE')
+        self.assertEqual(len(images), 2)
+        self.assertEqual(images[0].image_def, images[1].image_def)
+        self.assertTrue(os.path.isfile(os.path.join(self.test_dir, images[0].image_def.dxf.filename)))
+
+        with mock.patch.object(backend_dxf, 'IMAGE_DPI', fig.dpi / 2):
+            image = backend_dxf.FigureCanvasDXF(fig).draw().modelspace().query('IMAGE')[0]
+        self.assertAlmostEqual(image.dxf.image_size.x, images[0].dxf.image_size.x / 2, delta=1)
+        self.assertAlmostEqual(image.dxf.u_pixel.x, 2, delta=0.1)
+
+    def test_streaming(self):
+        """Test that a streamed export has the same entities."""
+        fig, ax = plt.subplots()
+        for i in range(5):
+            ax.plot(random(100))
+        ax.bar(range(5), random(5), hatch='//')
+        ax.set_title('streamed')
+        canvas = backend_dxf.FigureCanvasDXF(fig)
+        outfile = os.path.join(self.test_dir, 'test_streaming.dxf')
+        with mock.patch.object(backend_dxf, 'STREAM_FLUSH_ENTITIES', 10):
+            canvas.print_dxf(outfile, streaming=True)
+        streamed = ezdxf.readfile(outfile)
+        self.assertEqual(len(streamed.audit().errors), 0)
+        expected = canvas.draw()
+        self.assertEqual(sorted(e.dxftype() for e in streamed.modelspace()),
+                         sorted(e.dxftype() for e in expected.modelspace()))
+
+    def test_streaming_quad_mesh(self):
+        """Test that the clipped cells of a streamed mesh are written out."""
+        fig, ax = plt.subplots()
+        ax.pcolormesh(random((100, 10)))
+        ax.set_xlim(0.5, 9.5)
+        canvas = backend_dxf.FigureCanvasDXF(fig)
+        renderer = canvas.get_dxf_renderer()
+        piled_up = []
+        flush = renderer._flush_entities
+
+        def flush_entities():
+            piled_up.append(len(renderer.modelspace.entity_space))
+            flush()
+
+        with mock.patch.object(backend_dxf, 'STREAM_FLUSH_ENTITIES', 10), \
+                mock.patch.object(renderer, '_flush_entities', flush_entities):
+            canvas.print_dxf(io.StringIO(), streaming=True)
+        self.assertLessEqual(max(piled_up), 10)
+
+    def test_binary_and_compressed(self):
+        """Test binary, gzip and file object output."""
+        fig, ax = plt.subplots()
+        ax.plot(random(100))
+        ax.set_title('binary')
+        expected = sorted(e.dxftype() for e in
+                          backend_dxf.FigureCanvasDXF(fig).draw().modelspace())
+
+        for streaming in (False, True):
+            outfile = os.path.join(self.test_dir, 'test_binary.dxf')
+            backend_dxf.FigureCanvasDXF(fig).print_dxf(outfile, fmt='bin', streaming=streaming)
+            with open(outfile, 'rb') as fh:
+                self.assertTrue(fh.read(22).startswith(b'AutoCAD Binary DXF'))
+            drawing = ezdxf.readfile(outfile)
+            self.assertEqual(sorted(e.dxftype() for e in drawing.modelspace()), expected)
+
+            buf = io.BytesIO()
+            backend_dxf.FigureCanvasDXF(fig).print_dxf(buf, compression='gzip', streaming=streaming)
+            self.assertFalse(buf.closed)
+            text = gzip.decompress(buf.getvalue()).decode('utf-8')
+            drawing = ezdxf.read(io.StringIO(text))
+            self.assertEqual(sorted(e.dxftype() for e in drawing.modelspace()), expected)
+
+        # a fresh figure, so that savefig goes through the registered backend
+        fig, ax = plt.subplots()
+        ax.plot(random(100))
+        outfile = os.path.join(self.test_dir, 'test_binary.dxfz')
+        fig.savefig(outfile)
+        with gzip.open(outfile) as fh:
+            self.assertTrue(fh.read(100).lstrip().startswith(b'0'))
+        with self.assertRaises(ValueError):
+            backend_dxf.FigureCanvasDXF(fig).print_dxf(io.StringIO(), fmt='bin')
+
+    def test_incremental(self):
+        """Test that an incremental export only draws the changed artists."""
+        fig, ax = plt.subplots()
+        lines = [ax.plot(random(50))[0] for i in range(5)]
+        ax.bar(range(5), random(5), hatch='//')
+        canvas = backend_dxf.FigureCanvasDXF(fig)
+        n_entities = len(canvas.draw().modelspace())
+        # saving twice must not duplicate entities
+        self.assertEqual(len(canvas.draw().modelspace()), n_entities)
+
+        canvas.draw(incremental=True)
+        drawing = canvas.draw(incremental=True)
+        self.assertEqual(canvas.dxf_renderer.incremental_stats['drawn'], 0)
+        self.assertEqual(len(drawing.modelspace()), n_entities)
+
+        lines[2].set_ydata(random(50))
+        lines[4].remove()
+        drawing = canvas.draw(incremental=True)
+        self.assertEqual(canvas.dxf_renderer.incremental_stats['drawn'], 1)
+        self.assertEqual(len(drawing.audit().errors), 0)
+        expected = backend_dxf.FigureCanvasDXF(fig).draw()
+        self.assertEqual([e.dxftype() for e in drawing.modelspace()],
+                         [e.dxftype() for e in expected.modelspace()])
+        self.assertEqual(len(drawing.groups), len(expected.groups))
+
+    def test_incremental_savefig(self):
+        """Test that incremental exports with savefig reuse the last one."""
+        fig, ax = plt.subplots()
+        lines = [ax.plot(random(50))[0] for i in range(5)]
+        outfile = os.path.join(self.test_dir, 'test_incremental.dxf')
+        fig.savefig(outfile, incremental=True)
+        renderer = backend_dxf._incremental_renderers[fig][1]
+        lines[2].set_ydata(random(50))
+        fig.savefig(outfile, incremental=True)
+        self.assertIs(backend_dxf._incremental_renderers[fig][1], renderer)
+        self.assertEqual(renderer.incremental_stats['drawn'], 1)
+        self.assertEqual(len(ezdxf.readfile(outfile).modelspace()), len(renderer.modelspace))
+
+    def test_save_figures(self):
+        """Test that figures share one drawing with a layout per figure."""
+        figures = []
+        for i in range(3):
+            fig, ax = plt.subplots(figsize=(4 + i, 3))
+            ax.plot(range(5), 'o-')
+            ax.set_title('page %d' % i)
+            figures.append(fig)
+        outfile = os.path.join(self.test_dir, 'test_save_figures.dxf')
+        backend_dxf.save_figures(figures, outfile, names=['A', 'B', 'C'])
+        drawing = ezdxf.readfile(outfile)
+        self.assertEqual(len(drawing.audit().errors), 0)
+        self.assertEqual(drawing.layout_names()[1:], ['A', 'B', 'C'])
+        # the markers of all figures share one block
+        single = backend_dxf.FigureCanvasDXF(figures[0]).draw()
+        def markers(doc):
+            return [b.name for b in doc.blocks if b.name.startswith('MPL_MARKER')]
+        self.assertEqual(markers(drawing), markers(single))
+        self.assertEqual(len(drawing.modelspace()), sum(
+            len(backend_dxf.FigureCanvasDXF(fig).draw().modelspace()) for fig in figures))
+        # the viewports show the figures next to each other
+        centers = [[vp.dxf.view_center_point.x for vp in drawing.layout(name).query('VIEWPORT')
+                    if vp.dxf.status == -1][0] for name in 'ABC']
+        self.assertEqual(centers, sorted(centers))
+        texts = sorted(drawing.modelspace().query('TEXT'), key=lambda t: t.dxf.insert.x)
+        self.assertEqual([t.dxf.text for t in texts if t.dxf.text.startswith('page')],
+                         ['page 0', 'page 1', 'page 2'])
+
+    def test_gc_attribs(self):
+        """Test that the DXF attributes are resolved once per style."""
+        self.assertIs(backend_dxf.get_color_attribs((1, 0, 0, 1)),
+                      backend_dxf.get_color_attribs(np.array([1., 0., 0., 0.5])))
+        self.assertEqual(backend_dxf.get_color_attribs((0, 0, 0)), {'color': 7})
+        with self.assertRaises(TypeError):
+            backend_dxf.get_color_attribs((1, 0, 0))['color'] = 1
+
+        fig, ax = plt.subplots()
+        for i in range(20):
+            ax.plot(random(5), ls='--', color='C%d' % (i % 2))
+        renderer = backend_dxf.FigureCanvasDXF(fig).get_dxf_renderer()
+        with mock.patch.object(renderer, '_resolve_gc', wraps=renderer._resolve_gc) as resolve:
+            fig.draw(renderer)
+        lines = [e for e in renderer.modelspace.query('LWPOLYLINE') if e.dxf.hasattr('linetype')]
+        self.assertEqual(len(lines), 20)
+        self.assertEqual(len({line.dxf.true_color for line in lines}), 2)
+        self.assertLess(resolve.call_count, 10)
+
+    def test_text_metrics_cache(self):
+        """Test that text extents are reused by new renderers."""
+        fig, ax = plt.subplots()
+        ax.set_title('cached title')
+        backend_dxf.FigureCanvasDXF(fig).draw()
+        cache = backend_dxf.text_metrics_cache
+        hits, misses = cache.hits, cache.misses
+        backend_dxf.FigureCanvasDXF(fig).draw()
+        self.assertGreater(cache.hits, hits)
+        self.assertEqual(cache.misses, misses)
+
+    def test_mathtext_cache(self):
+        """Test that mathtext is parsed once per string and font."""
+        fig, ax = plt.subplots()
+        ax.text(0.5, 0.5, r'$10^{3}$')
+        cache = backend_dxf.mathtext_cache
+        cache.clear()
+        for i in range(2):
+            drawing = backend_dxf.FigureCanvasDXF(fig).draw()
+        self.assertEqual(cache.info().misses, 1)
+        self.assertEqual(cache.info().hits, 1)
+        texts = [t.dxf.text for t in drawing.modelspace().query('TEXT')]
+        self.assertIn('10³', texts)
+
+    def test_render_stats(self):
+        """Test that savefig fills the render stats."""
+        fig, ax = plt.subplots()
+        ax.plot(range(5), '--')
+        ax.bar(range(3), [1, 2, 3], hatch='/')
+        stats = backend_dxf.RenderStats()
+        outfile = os.path.join(self.test_dir, 'test_render_stats.dxf')
+        with self.assertLogs('mpldxf.backend_dxf', 'INFO'):
+            fig.savefig(outfile, stats=stats)
+        self.assertGreater(stats.timings['draw_path'][0], len(ax.patches))
+        self.assertGreater(stats.timings['_draw_mpl_hatch'][1], 0)
+        self.assertIn('write', stats.timings)
+        drawing = ezdxf.readfile(outfile)
+        self.assertEqual(sum(stats.entities.values()), len(drawing.modelspace()))
+        self.assertEqual(stats.counts['linetypes'], 1)
+        self.assertIsNone(backend_dxf.FigureCanvasDXF(fig).get_dxf_renderer().stats)
+
+    def test_simplify(self):
+        """Test that dense lines are simplified when a tolerance is set."""
+        fig, ax = plt.subplots()
+        x = np.linspace(0, 10, 10000)
+        ax.plot(x, np.sin(x))
+
+        def line_vertices():
+            drawing = backend_dxf.FigureCanvasDXF(fig).draw()
+            return max((e.get_points('xy') for e in drawing.modelspace().query('LWPOLYLINE')), key=len)
+
+        full = line_vertices()
+        with mock.patch.object(backend_dxf, 'SIMPLIFY_TOLERANCE', 0.1):
+            simplified = line_vertices()
+        self.assertLess(len(simplified) * 10, len(full))
+        self.assertEqual(simplified[0], full[0])
+        self.assertEqual(simplified[-1], full[-1])
+
+    def test_decimate(self):
+        """Test that large series are decimated and split into chunks."""
+        fig, ax = plt.subplots()
+        x = np.linspace(0, 10, 100000)
+        line, = ax.plot(x, np.random.default_rng(0).normal(size=len(x)))
+        color = backend_dxf.get_color_attribs(mcolors.to_rgb(line.get_color()))['true_color']
+
+        def line_polylines():
+            drawing = backend_dxf.FigureCanvasDXF(fig).draw()
+            return [e.get_points('xy') for e in drawing.modelspace().query('LWPOLYLINE')
+                    if e.dxf.get('true_color') == color]
+
+        full, = line_polylines()
+        with mock.patch.object(backend_dxf, 'DECIMATE_MIN_VERTICES', 10000):
+            decimated, = line_polylines()
+            self.assertLess(len(decimated) * 10, len(full))
+            self.assertEqual(decimated[0], full[0])
+            self.assertEqual(decimated[-1], full[-1])
+            self.assertAlmostEqual(min(p[1] for p in decimated), min(p[1] for p in full))
+            self.assertAlmostEqual(max(p[1] for p in decimated), max(p[1] for p in full))
+            with mock.patch.object(backend_dxf, 'POLYLINE_MAX_VERTICES', 500):
+                chunks = line_polylines()
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(len(chunk) <= 500 for chunk in chunks))
+        self.assertEqual(sum(len(chunk) - 1 for chunk in chunks) + 1, len(decimated))
@@ -0,0 +1,96 @@
+"""Test the parallel batch export."""
+import contextlib
+import io
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import ezdxf
+import matplotlib
+from matplotlib import pyplot as plt
+
+from mpldxf import batch
+from mpldxf.__main__ import main
+
+
+def make_figure():
+    fig, ax = plt.subplots()
+    ax.plot(range(10))
+    ax.set_title('batch')
+    return fig
+
+
+def make_nothing():
+    return None
+
+
+class BatchTestCase(unittest.TestCase):
+    """Tests for the batch export API and command line."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.pickle_path = os.path.join(self.test_dir, 'pickled.pickle')
+        fig = make_figure()
+        with open(self.pickle_path, 'wb') as fh:
+            pickle.dump(fig, fh)
+        plt.close(fig)
+
+    def tearDown(self):
+        if os.path.isdir(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_export_figures(self):
+        """Figures of all sources are exported, failures are reported."""
+        jobs = [(make_figure, os.path.join(self.test_dir, 'factory.dxf')),
+                (self.pickle_path, os.path.join(self.test_dir, 'pickled.dxf')),
+                (make_nothing, os.path.join(self.test_dir, 'nothing.dxf'))]
+        for processes in (1, 2):
+            results = batch.export_figures(jobs, processes=processes)
+            self.assertEqual([r.filename for r in results], [filename for _, filename in jobs])
+            for result in results[:2]:
+                self.assertIsNone(result.error)
+                drawing = ezdxf.readfile(result.filename)
+                self.assertEqual(len(drawing.modelspace()), result.entities)
+            self.assertIn('TypeError', results[2].error)
+            self.assertIsNone(results[2].entities)
+
+    def test_in_process(self):
+        """An export in the calling process leaves its backend and figures alone."""
+        fig = make_figure()
+        self.addCleanup(plt.close, fig)
+        canvas = fig.canvas
+        backend = matplotlib.get_backend()
+        with mock.patch.object(matplotlib, 'use') as use:
+            results = batch.export_figures([(fig, os.path.join(self.test_dir, 'figure.dxf'))],
+                                           processes=1)
+        self.assertIsNone(results[0].error)
+        use.assert_not_called()
+        self.assertEqual(matplotlib.get_backend(), backend)
+        self.assertIn(fig.number, plt.get_fignums())
+        self.assertIs(fig.canvas, canvas)
+
+    def test_main(self):
+        """The command line exports to the output directory."""
+        out_dir = os.path.join(self.test_dir, 'out')
+        with contextlib.redirect_stdout(io.StringIO()) as stdout:
+            status = main(['-j', '1', '-o', out_dir, '--compression', 'gzip',
+                           self.pickle_path, 'mpldxf.test_batch:make_figure'])
+        self.assertEqual(status, 0)
+        self.assertEqual(sorted(os.listdir(out_dir)), ['make_figure.dxfz', 'pickled.dxfz'])
+        self.assertIn('2 figures exported, 0 failed', stdout.getvalue())
+
+    def test_main_duplicate_names(self):
+        """Sources that would be exported to the same file are refused."""
+        other_dir = os.path.join(self.test_dir, 'other')
+        os.makedirs(other_dir)
+        shutil.copy(self.pickle_path, other_dir)
+        out_dir = os.path.join(self.test_dir, 'out')
+        with contextlib.redirect_stderr(io.StringIO()) as stderr:
+            with self.assertRaises(SystemExit):
+                main(['-j', '1', '-o', out_dir, self.pickle_path,
+                      os.path.join(other_dir, 'pickled.pickle')])
+        self.assertIn('are both exported to', stderr.getvalue())
+        self.assertFalse(os.path.exists(out_dir))
@@ -0,0 +1,40 @@
+"""Smoke test of the benchmark suite."""
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from mpldxf import benchmark
+
+
+class BenchmarkTestCase(unittest.TestCase):
+    """Run every scenario once at a tiny size."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        if os.path.isdir(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_run_benchmarks(self):
+        report = benchmark.run_benchmarks(sizes=[10], repeat=1)
+        self.assertEqual([r['scenario'] for r in report['results']], list(benchmark.SCENARIOS))
+        for result in report['results']:
+            self.assertGreater(result['seconds'], 0)
+            self.assertGreater(result['peak_memory'], 0)
+            self.assertGreater(result['output_bytes'], 0)
+            self.assertIn('TEXT', result['entities'])
+        self.assertEqual(len(benchmark.compare(report, report)), len(report['results']) + 1)
+
+    def test_main(self):
+        output = os.path.join(self.test_dir, 'results.json')
+        with contextlib.redirect_stdout(io.StringIO()):
+            benchmark.main(['lines', '--quick', '--repeat', '1', '-o', output])
+        with open(output) as fh:
+            report = json.load(fh)
+        self.assertEqual([(r['scenario'], r['size']) for r in report['results']], [('lines', 1000)])
+        self.assertIn('ezdxf', report['meta'])
@@ -0,0 +1,38 @@
+"""Test the on-disk font index."""
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from mpldxf import font_index
+
+
+class FontIndexTestCase(unittest.TestCase):
+    """Tests for the cached font index."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.index_path = os.path.join(self.test_dir, 'fontindex.json')
+        patcher = mock.patch.object(font_index, 'get_font_index_path',
+                                    return_value=self.index_path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(setattr, font_index, '_ttf_files', None)
+
+    def tearDown(self):
+        if os.path.isdir(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_rebuild_and_reuse(self):
+        """A rebuilt index is written to disk and reused without reading fonts."""
+        ttf_files = font_index.rebuild_font_index()
+        self.assertTrue(os.path.isfile(self.index_path))
+        with open(self.index_path) as fh:
+            self.assertEqual(len(json.load(fh)), len(ttf_files))
+
+        font_index._ttf_files = None
+        with mock.patch.object(font_index, '_read_font_data') as read:
+            self.assertEqual(font_index.get_ttf_files(), ttf_files)
+            read.assert_not_called()
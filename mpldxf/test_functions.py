@@ -0,0 +1,222 @@
+"""Test the geometry helper functions."""
+import unittest
+
+import numpy as np
+from shapely.geometry import box, LineString, MultiLineString, Polygon
+
+from matplotlib.path import Path
+
+from mpldxf.functions import (LRUCache, chunk_polyline, clip_geometry, clip_polygons,
+                              clip_rectangle, clip_segments, decimate_minmax,
+                              even_odd_polygon, hatch_pattern_definition, nesting_depths,
+                              simplify_polyline, tile_hatch)
+
+
+class ClipRectangleTestCase(unittest.TestCase):
+    """Tests for clipping polylines to a rectangle."""
+
+    def test_runs(self):
+        """A polyline leaving and re-entering the box gives two runs."""
+        vertices = np.array([[-1, 0.5], [0.5, 0.5], [0.5, 2], [0.7, 2], [0.7, 0.2], [0.9, 0.2]])
+        runs = clip_rectangle(vertices, (0, 0, 1, 1))
+        self.assertEqual(len(runs), 2)
+        np.testing.assert_allclose(runs[0], [[0, 0.5], [0.5, 0.5], [0.5, 1]])
+        np.testing.assert_allclose(runs[1], [[0.7, 1], [0.7, 0.2], [0.9, 0.2]])
+
+    def test_inside_outside(self):
+        """Polylines inside are returned unchanged, outside ones dropped."""
+        vertices = np.array([[0.1, 0.1], [0.2, 0.2], [0.3, 0.1]])
+        runs = clip_rectangle(vertices, (0, 0, 1, 1))
+        self.assertEqual(len(runs), 1)
+        np.testing.assert_array_equal(runs[0], vertices)
+        self.assertEqual(clip_rectangle([[2, 2], [3, 3]], (0, 0, 1, 1)), [])
+        # only touching a corner
+        self.assertEqual(clip_rectangle([[1, 2], [2, 1]], (0, 0, 1, 1)), [])
+
+    def test_matches_shapely(self):
+        """The rectangle clipper covers the same geometry as shapely."""
+        rng = np.random.default_rng(0)
+        for _ in range(100):
+            vertices = np.cumsum(rng.normal(size=(20, 2)), axis=0) * 0.3
+            expected = clip_geometry(vertices, box(-1, -1, 1, 1))
+            clipped = clip_geometry(vertices, (-1, -1, 1, 1))
+            self.assertEqual(expected is None, clipped is None)
+            if clipped is not None:
+                exact = LineString(vertices).intersection(box(-1, -1, 1, 1))
+                self.assertLess(exact.difference(LineString(clipped).buffer(1e-7)).length, 1e-6)
+
+
+class ClipPolygonsTestCase(unittest.TestCase):
+    """Tests for clipping polygons to a rectangle."""
+
+    def test_corner(self):
+        """Polygons crossing a corner keep the corner of the box."""
+        polygons = np.array([
+            [[0.5, 0.5], [1.5, 0.5], [1.5, 1.5], [0.5, 1.5]],
+            [[2, 2], [3, 2], [3, 3], [2, 3]],
+        ])
+        clipped = clip_polygons(polygons, (0, 0, 1, 1))
+        self.assertEqual(len(clipped), 2)
+        self.assertEqual(len(clipped[0]), 1)
+        self.assertAlmostEqual(Polygon(clipped[0][0]).area, 0.25)
+        self.assertIn([1, 1], clipped[0][0].tolist())
+        self.assertEqual(clipped[1], [])
+
+
+class ClipSegmentsTestCase(unittest.TestCase):
+    """Tests for clipping self intersecting polylines."""
+
+    def test_self_intersecting(self):
+        """Pieces of a self intersecting polyline are kept apart."""
+        clippoly = box(0, 0, 1, 1)
+        # a bow tie crossing itself inside the box and leaving it on the right
+        vertices = np.array([[0.2, 0.2], [1.5, 0.8], [1.5, 0.2], [0.2, 0.8], [0.2, 0.2]])
+        self.assertFalse(LineString(vertices).is_simple)
+        runs = clip_geometry(vertices, clippoly, join=False)
+        self.assertEqual(len(runs), 2)
+        np.testing.assert_allclose(runs[0], [[0.2, 0.2], [1, 0.2 + 0.6 * 0.8 / 1.3]])
+        np.testing.assert_allclose(runs[1], [[1, 0.8 - 0.6 * 0.8 / 1.3], [0.2, 0.8], [0.2, 0.2]])
+        joined = clip_geometry(vertices, clippoly)
+        np.testing.assert_allclose(joined, np.concatenate(runs))
+
+    def test_matches_shapely(self):
+        """The batched clipper covers exactly the shapely intersection."""
+        clippoly = Polygon([(-1, -1), (1, -1), (1, 1), (0, 0.2), (-1, 1)])
+        rng = np.random.default_rng(0)
+        for _ in range(50):
+            vertices = np.cumsum(rng.normal(size=(30, 2)), axis=0) * 0.4
+            exact = LineString(vertices).intersection(clippoly)
+            clipped = MultiLineString(clip_segments(vertices, clippoly))
+            self.assertLess(exact.difference(clipped.buffer(1e-7)).length, 1e-6)
+            self.assertLess(clipped.difference(exact.buffer(1e-7)).length, 1e-6)
+
+
+class TileHatchTestCase(unittest.TestCase):
+    """Tests for the hatch tiling."""
+
+    def test_tile_hatch(self):
+        """Tiles are clipped to the parent and returned in tile order."""
+        line = np.array([[0., 0.5], [1., 0.5]])
+        square = np.array([[0.25, 0.25], [0.75, 0.25], [0.75, 0.75], [0.25, 0.25]])
+        shapes = tile_hatch([line, square], 1, 1, 1.0, box(-1.5, -1.5, 1.0, 1.0))
+        self.assertEqual([shape.geom_type for shape in shapes],
+                         ['LineString', 'Polygon'] * 4)
+        self.assertEqual(shapes[0].bounds, (-1.0, -0.5, 0.0, -0.5))
+        self.assertEqual(shapes[2].bounds, (0.0, -0.5, 1.0, -0.5))
+        # the last column only touches the clip box and the top row is outside
+        self.assertEqual(shapes[-2].bounds, (0.0, 0.5, 1.0, 0.5))
+
+
+class NestingTestCase(unittest.TestCase):
+    """Tests for the rings of compound paths."""
+
+    def setUp(self):
+        squares = [box(0, 0, 10, 10), box(2, 2, 8, 8), box(4, 4, 6, 6), box(20, 0, 22, 2)]
+        self.rings = [np.array(square.exterior.coords) for square in squares]
+
+    def test_nesting_depths(self):
+        np.testing.assert_array_equal(nesting_depths(self.rings), [0, 1, 2, 0])
+        np.testing.assert_array_equal(nesting_depths(self.rings[:1]), [0])
+
+    def test_even_odd_polygon(self):
+        area = even_odd_polygon(self.rings)
+        self.assertEqual(area.geom_type, 'MultiPolygon')
+        self.assertAlmostEqual(area.area, 100 - 36 + 4 + 4)
+        self.assertFalse(area.contains(Polygon([(3, 3), (3, 4), (4, 3)])))
+        self.assertEqual(even_odd_polygon(self.rings[:1]).area, 100)
+
+
+class HatchPatternTestCase(unittest.TestCase):
+    """Tests for the conversion of hatches to DXF patterns."""
+
+    def test_lines(self):
+        """Hatch lines become one solid pattern line per direction."""
+        definition = hatch_pattern_definition(Path.hatch('+').to_polygons(closed_only=False))
+        self.assertEqual(len(definition), 2)
+        angles = sorted(round(angle) for angle, base, offset, dashes in definition)
+        self.assertEqual(angles, [0, 90])
+        for angle, base, offset, dashes in definition:
+            self.assertEqual(dashes, [])
+            self.assertAlmostEqual(np.hypot(*offset), 1 / 6)
+
+    def test_shapes(self):
+        """Segments repeated on the hatch lattice share a pattern line."""
+        polygons = Path.hatch('o').to_polygons(closed_only=False)
+        definition = hatch_pattern_definition(polygons)
+        n_segments = sum(len(vertices) - 1 for vertices in polygons)
+        self.assertLess(len(definition), n_segments / 20)
+        for angle, base, offset, dashes in definition:
+            self.assertEqual(len(dashes), 2)
+            self.assertGreater(dashes[0], 0)
+            self.assertLess(dashes[1], 0)
+
+
+class SimplifyPolylineTestCase(unittest.TestCase):
+    """Tests for simplifying polylines."""
+
+    def test_open_polyline(self):
+        x = np.linspace(0, 10, 1001)
+        vertices = np.column_stack([x, 0.001 * np.sin(50 * x)])
+        simplified = simplify_polyline(vertices, 0.01)
+        self.assertEqual(len(simplified), 2)
+        np.testing.assert_array_equal(simplified, vertices[[0, -1]])
+        # nothing is removed beyond the tolerance
+        zigzag = np.column_stack([x, 0.001 * (-1) ** np.arange(len(x))])
+        self.assertEqual(len(simplify_polyline(zigzag, 1e-4)), len(zigzag))
+
+    def test_closed_ring(self):
+        angles = np.linspace(0, 2 * np.pi, 400, endpoint=False)
+        ring = np.column_stack([np.cos(angles), np.sin(angles)])
+        simplified = simplify_polyline(ring, 0.01, closed=True)
+        self.assertLess(len(simplified), 50)
+        self.assertFalse(np.array_equal(simplified[0], simplified[-1]))
+        # a large tolerance cannot collapse the ring
+        closed = np.vstack([ring, ring[:1]])
+        simplified = simplify_polyline(closed, 10, closed=True)
+        self.assertGreaterEqual(len(simplified), 4)
+        np.testing.assert_array_equal(simplified[0], simplified[-1])
+
+
+class DecimateMinmaxTestCase(unittest.TestCase):
+    """Tests for decimating large series."""
+
+    def test_envelope(self):
+        x = np.linspace(0, 10, 100001)
+        y = np.random.default_rng(0).normal(size=len(x))
+        vertices = np.column_stack([x, y])
+        decimated = decimate_minmax(vertices, 0.1)
+        self.assertLessEqual(len(decimated), 4 * 101)
+        np.testing.assert_array_equal(decimated[[0, -1]], vertices[[0, -1]])
+        # the vertices keep their order and every column its extremes
+        self.assertTrue(np.all(np.diff(decimated[:, 0]) > 0))
+        for column in range(100):
+            inside = (x >= column * 0.1) & (x < (column + 1) * 0.1)
+            kept = decimated[(decimated[:, 0] >= column * 0.1) & (decimated[:, 0] < (column + 1) * 0.1)]
+            self.assertEqual(kept[:, 1].min(), y[inside].min())
+            self.assertEqual(kept[:, 1].max(), y[inside].max())
+
+    def test_chunk_polyline(self):
+        vertices = np.arange(22).reshape(11, 2)
+        self.assertEqual(len(chunk_polyline(vertices, 11)), 1)
+        chunks = chunk_polyline(vertices, 4)
+        self.assertEqual([len(c) for c in chunks], [4, 4, 4, 2])
+        for previous, chunk in zip(chunks, chunks[1:]):
+            np.testing.assert_array_equal(previous[-1], chunk[0])
+        np.testing.assert_array_equal(chunks[-1][-1], vertices[-1])
+
+
+class LRUCacheTestCase(unittest.TestCase):
+    """Tests for the bounded cache."""
+
+    def test_eviction_and_stats(self):
+        cache = LRUCache(maxsize=2)
+        cache['a'] = 1
+        cache['b'] = 2
+        self.assertEqual(cache.get('a'), 1)
+        cache['c'] = 3
+        # 'b' was used least recently
+        self.assertNotIn('b', cache)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.info(), (1, 1, 2, 2))
+        cache.clear()
+        self.assertEqual(cache.info(), (0, 0, 2, 0))
@@ -61,6 +61,7 @@ setup(
         "matplotlib",
         "sympy",
         "numpy",
+        "shapely>=2.0",
         "pandas"
     ],
     dependency_links=[